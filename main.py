@@ -1,42 +1,75 @@
-import datetime
+import functools
 import os
 import sys
-
-from timely.utils import (titlebar, timestamp,
-                          pixmap, application,
-                          afk, sound)
-from timely.models import SpentTime
+import typing
+
+from timely.utils import titlebar, aggregation, pixmap, application
+from timely.utils.export import QExporter
+from timely.utils.tracker import Tracker
+from timely.utils.worker import QStorageWorker
+from timely.models import SpentTime, migrate, checkpoint, snapshot, storage, archiveClosed
+from timely.models.spenttime import session
+from timely.models.rollup import bucketKey
+from timely.samplers import getSampler
 from timely.themes import QTheme
 from timely.ui import (QStatisticView, QStatisticChoose,
                        QApplicationList, QTypeChoose,
                        QShareButton)
 
-from PySide6.QtCore import QTimer, QFileSystemWatcher, Qt
-from PySide6.QtGui import (QImage, QClipboard, QPixmap,
-                           QColor, QResizeEvent)
-from PySide6.QtWidgets import QWidget, QApplication, QMenu, QSystemTrayIcon
+from PySide6.QtCore import QTimer, QFileSystemWatcher, Qt, Signal, QSize, QPoint
+from PySide6.QtGui import QPixmap, QResizeEvent, QActionGroup
+from PySide6.QtWidgets import QWidget, QApplication, QMenu, QSystemTrayIcon, QLabel, QFileDialog, QInputDialog
 
 
 class QWatcher(QWidget):
-    def __init__(self) -> None:
+    flushed = Signal(int, object)
+
+    def __init__(self, flush_interval: int = 60, mode: str = "poll", heartbeat_interval: int = 30,
+                 sessions: bool = False, checkpoint_interval: int = 300, archive: bool = False,
+                 compress: bool = False) -> None:
         super().__init__()
 
-        SpentTime.create_table()
+        self._worker = QStorageWorker.instance()
+        self._worker.submit(migrate)
+
+        if archive:
+            self._worker.submit(archiveClosed, compress)
+
+        self._worker.submit(storage.generation, callback=self.ready, errback=self.ready)
+
+        self._ready = False
+        self._waiting = False
 
         self._statistic = None
         self._path = os.path.dirname(os.path.realpath(__file__))
 
+        self._tracker = Tracker(getSampler(), sessions=sessions)
+        self._flush_interval = flush_interval
+
+        self._mode = mode
+        self._events = False
+        self._heartbeat_interval = heartbeat_interval
+
         self._timer = QTimer()
         self._timer.timeout.connect(self.watch)  # noqa
 
+        self._flush_timer = QTimer()
+        self._flush_timer.timeout.connect(self.flush)  # noqa
+
+        self._checkpoint_interval = checkpoint_interval
+
+        self._checkpoint_timer = QTimer()
+        self._checkpoint_timer.timeout.connect(self.checkpoint)  # noqa
+
         self._menu = QMenu()
 
         self._menu.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self._menu.setWindowFlag(Qt.WindowType.FramelessWindowHint)
         self._menu.setWindowFlag(Qt.WindowType.NoDropShadowWindowHint)
 
-        self._menu.addAction("Statistic", self.statistic)
-        self._menu.addAction("Quit", sys.exit)
+        self._statistic_action = self._menu.addAction("Statistic", self.statistic)
+        self._statistic_action.setEnabled(self._ready)
+        self._menu.addAction("Quit", QApplication.quit)
 
         self._tray = QSystemTrayIcon(self)
         self._tray.setContextMenu(self._menu)
@@ -46,49 +79,132 @@ class QWatcher(QWidget):
         )
         self._tray.show()
 
-        self._watcher = QFileSystemWatcher([f"{self._path}/files/themes/my.theme"])
-        self._watcher.fileChanged.connect(self.updateTheme)  # noqa
+        self._theme = f"{self._path}/files/themes/my.theme"
+
+        self._watcher = QFileSystemWatcher([self._theme])
+        self._watcher.fileChanged.connect(self.themeChanged)  # noqa
+
+        self._theme_timer = QTimer()
+        self._theme_timer.setSingleShot(True)
+        self._theme_timer.setInterval(250)
+        self._theme_timer.timeout.connect(self.updateTheme)  # noqa
 
+        app.aboutToQuit.connect(self.shutdown)  # noqa
         app.setStyleSheet(
-            QTheme.load(f"{self._path}/files/themes/my.theme")
+            QTheme.load(self._theme)
         )
 
-    @staticmethod
-    def watch() -> None:
-        try:
-            if afk.getIdleDuration() > 300 and not sound.mediaIsPlaying():
-                return
+        QTheme.subscribe(QTheme.keys("application"), self.updateStyleSheet)
 
-            title, path = application.getCurrentApplication()
-            if SpentTime.select().where(
-                    (SpentTime.path == path) & (SpentTime.timestamp == datetime.date.today())).exists():
-                spent_time = SpentTime.select().where(
-                    (SpentTime.path == path) & (SpentTime.timestamp == datetime.date.today())
-                ).get()
+        pixmap.cache.warm([
+            ("icon.png", "titleBarIconColor", None),
+            ("share.png", "iconColor", None),
+            ("time.png", "iconColor", QSize(20, 20)),
+            ("calendar.png", "iconColor", QSize(20, 20))
+        ], app.primaryScreen().devicePixelRatio())
 
-                spent_time.spent += 1
-                spent_time.save()
+    def watch(self) -> None:
+        try:
+            if self._events:
+                rolled = self._tracker.heartbeat()
             else:
-                SpentTime(
-                    path=path, timestamp=datetime.date.today(), spent=1
-                ).save()
+                rolled = self._tracker.tick()
+
+            if rolled:
+                self.flush()
         except Exception as _:
             del _
 
+    def focus(self) -> None:
+        try:
+            self._tracker.focus()
+        except Exception as _:
+            del _
+
+    def flushTracker(self) -> tuple[int, list[tuple[str, typing.Any, int]]]:
+        rows = self._tracker.flush()
+        for path, _, _ in rows:
+            application.getApplicationTitle(path)
+
+        return storage.generation(), rows
+
+    def flush(self) -> None:
+        def handle(result: tuple[int, list[tuple[str, typing.Any, int]]]) -> None:
+            if result[1]:
+                self.flushed.emit(*result)
+
+        self._worker.submit(self.flushTracker, callback=handle)
+
+    def checkpoint(self, mode: str = "PASSIVE") -> None:
+        self._worker.submit(checkpoint, mode)
+
+    def shutdown(self) -> None:
+        self._tracker.sampler().unsubscribe()
+
+        self.flush()
+        self.checkpoint("TRUNCATE")
+
+        self._worker.join()
+
+    def setFlushInterval(self, interval: int) -> None:
+        self._flush_interval = interval
+
+        if self._flush_timer.isActive():
+            self._flush_timer.start(self._flush_interval * 1000)
+
+    def themeChanged(self) -> None:
+        if self._theme not in self._watcher.files():
+            self._watcher.addPath(self._theme)
+
+        self._theme_timer.start()
+
     def updateTheme(self) -> None:
+        try:
+            QTheme.reload(self._theme)
+        except Exception as _:
+            del _
+
+    def updateStyleSheet(self) -> None:
         app.setStyleSheet(
-            QTheme.load(f"{self._path}/files/themes/my.theme")
+            QTheme.stylesheet()
         )
 
-        if self._statistic:
-            self._statistic.updateApplicationProperty()
+    def ready(self, result: object = None) -> None:
+        self._ready = True
+        self._statistic_action.setEnabled(True)
+
+        if self._waiting:
+            self._waiting = False
+
+            self.statistic()
 
     def statistic(self) -> None:
+        if not self._ready:
+            self._waiting = True
+
+            return
+
+        self.flush()
+
+        if self._statistic:
+            self.flushed.disconnect(self._statistic.pushDeltas)
+
         self._statistic = QMain()
         self._statistic.show()
 
+        self.flushed.connect(self._statistic.pushDeltas)  # noqa
+
     def start(self) -> None:
-        self._timer.start(1000)
+        self._events = self._mode == "event" and self._tracker.sampler().subscribe(self.focus)
+
+        if self._events:
+            self.focus()
+            self._timer.start(self._heartbeat_interval * 1000)
+        else:
+            self._timer.start(1000)
+
+        self._flush_timer.start(self._flush_interval * 1000)
+        self._checkpoint_timer.start(self._checkpoint_interval * 1000)
 
 
 class QMain(QWidget):
@@ -98,7 +214,24 @@ class QMain(QWidget):
         self.setFixedSize(400, 700)
 
         self._path = os.path.dirname(os.path.realpath(__file__))
-        self._applications = []
+        self._type = "all"
+
+        self._reader = QStorageWorker.reader()
+        self._generation = 0
+        self._pages = 0
+        self._paging = 0
+        self._page_size = 100
+
+        self._time = None
+        self._data = []
+
+        self._deltas = []
+        self._revisions = {"totals": 0, "applications": 0}
+
+        self._refresh = QTimer(self)
+        self._refresh.setSingleShot(True)
+        self._refresh.setInterval(1000)
+        self._refresh.timeout.connect(self.applyDeltas)  # noqa
 
         self._types_choose = QTypeChoose(self)
         self._types_choose.addTypes(
@@ -107,52 +240,240 @@ class QMain(QWidget):
 
         self._statistic_choose = QStatisticChoose(self)
         self._statistic_choose.connectData(self.chooseDelta)
+        self._statistic_choose.connectRequested(self.requestPage)
 
         self._statistic_view = QStatisticView(self)
         self._application_list = QApplicationList(self)
 
+        self._exporter = QExporter()
+        self._export_scale = 5
+        self._export_view = None
+
         self._share_button = QShareButton(self)
         self._share_button.pressed.connect(self.saveStatisticToClipboard)
+        self._share_button.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self._share_button.customContextMenuRequested.connect(self.shareMenu)  # noqa
 
-        self.updateApplicationProperty()
+        self._loading = QLabel("Loading...", self)
+        self._loading.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._loading.hide()
 
-    def updateApplicationProperty(self) -> None:
+        QTheme.style(self)
+        QTheme.subscribe(["titleBarIconColor", "titleBarTheme", "iconColor"], self.updateApplicationProperty)
+
+        self.updateApplicationProperty()
         self.chooseDeltaType("all")
 
+    def updateApplicationProperty(self) -> None:
         self.setWindowTitle(f"Timely ({os.environ['COMPUTERNAME']}/{os.environ['USERNAME']})")
         self.setWindowIcon(
-            pixmap.colorPixmap(QPixmap(f"{self._path}/files/icons/icon.png"), QColor(QTheme.get("titleBarIconColor")))
+            pixmap.cache.icon("icon.png", "titleBarIconColor", ratio=self.devicePixelRatioF())
         )
 
         if QTheme.get("titleBarTheme") == "dark":
             titlebar.setTileBarDarkTheme(self.window().winId())
 
         self._share_button.setIcon(
-            pixmap.colorPixmap(QPixmap(f"{self._path}/files/icons/share.png"), QColor(QTheme.get("iconColor")))
+            pixmap.cache.icon("share.png", "iconColor", ratio=self.devicePixelRatioF())
         )
 
+    def shareMenu(self, position: QPoint) -> None:
+        menu = QMenu(self)
+        menu.addAction("Copy to clipboard", self.saveStatisticToClipboard)
+        menu.addAction("Save image...", self.saveStatisticToFile)
+        menu.addSeparator()
+
+        actions = [menu.addAction("Export all...", self.exportStatistic)]
+        if self._type != "all":
+            actions.append(menu.addAction("Export range...", self.exportStatisticRange))
+
+        for action in actions:
+            action.setEnabled(not self._exporter.isExporting())
+
+        scales = menu.addMenu("Scale")
+        group = QActionGroup(scales)
+        for scale in (1, 2, 3, 4, 5, 8):
+            action = scales.addAction(f"{scale}x", functools.partial(self.setExportScale, scale))
+            action.setCheckable(True)
+            action.setChecked(scale == self._export_scale)
+
+            group.addAction(action)
+
+        menu.exec(self._share_button.mapToGlobal(position))
+
+    def setExportScale(self, scale: float) -> None:
+        self._export_scale = scale
+
     def saveStatisticToClipboard(self) -> None:
-        image = QImage(
-            self._statistic_view.width() * 5,
-            self._statistic_view.height() * 5,
-            QImage.Format.Format_ARGB32
+        self._exporter.export(self._statistic_view, scale=self._export_scale)
+
+    def saveStatisticToFile(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save image", f"{self._type}-{self._time or '_'}.png", "PNG (*.png);;JPEG (*.jpg);;SVG (*.svg)"
         )
-        image.setDevicePixelRatio(5)
 
-        self._statistic_view.render(image)
+        if path:
+            self._exporter.export(self._statistic_view, path, scale=self._export_scale)
+
+    @staticmethod
+    def selectRange(type: str, start: str = None, end: str = None) -> list[tuple[str, list[tuple[str, int]]]]:
+        data = aggregation.selectRange(type, SpentTime, start, end)
+        for _, rows in data:
+            for path, _ in rows:
+                application.getApplicationTitle(path)
+
+        return data
+
+    def exportStatisticRange(self) -> None:
+        if not (keys := self._statistic_choose.keys()):
+            return
+
+        current = keys.index(self._time) if self._time in keys else 0
 
-        QApplication.clipboard().setImage(
-            image, QClipboard.Mode.Clipboard
+        start, accepted = QInputDialog.getItem(
+            self, "Export range", "From:", keys[::-1], len(keys) - current - 1, False
         )
+        if not accepted:
+            return
+
+        end, accepted = QInputDialog.getItem(self, "Export range", "To:", keys, current, False)
+        if not accepted:
+            return
+
+        if aggregation.parseBucket(self._type, start) > aggregation.parseBucket(self._type, end):
+            start, end = end, start
+
+        self.exportStatistic(start=start, end=end)
+
+    def exportStatistic(self, directory: str = None, format: str = "png", start: str = None,
+                        end: str = None) -> None:
+        if self._exporter.isExporting():
+            return
+
+        if not (directory := directory or QFileDialog.getExistingDirectory(self, "Export statistic")):
+            return
+
+        if self._export_view is None:
+            self._export_view = QStatisticView()
+            self._export_view.setAnimated(False)
+            self._export_view.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen)
+            self._export_view.resize(self._statistic_view.size())
+            self._export_view.show()
+
+        def handle(data: list[tuple[str, list[tuple[str, int]]]]) -> None:
+            self._exporter.exportBatch(
+                self._export_view, data, directory, self._type, format, self._export_scale
+            )
+
+        self._reader.submit(self.selectRange, self._type, start, end, callback=handle)
+
+    @staticmethod
+    def selectApplications(type: str, time: str) -> tuple[str, list[tuple[str, int]]]:
+        data = aggregation.selectApplications(type, time, SpentTime)
+        for path, _ in data:
+            application.getApplicationTitle(path)
+
+        return time, data
+
+    def setLoading(self, loading: bool) -> None:
+        self._loading.setVisible(loading)
+        self._loading.raise_()
+
+    def request(self, function: typing.Callable, *args: object, callback: typing.Callable, revision: str) -> None:
+        self._generation += 1
+        generation = self._generation
+
+        def handle(result: tuple[int, object]) -> None:
+            if generation == self._generation:
+                self.setLoading(False)
+
+                self._revisions[revision], result = result
+                callback(result)
+
+                self._refresh.start()
+
+        def fail(_: Exception) -> None:
+            if generation == self._generation:
+                self.setLoading(False)
+
+        self.setLoading(True)
+        self._reader.submit(snapshot, function, *args, callback=handle, errback=fail)
+
+    def pushDeltas(self, version: int, rows: list[tuple[str, typing.Any, int]]) -> None:
+        self._deltas.append((version, rows))
+
+        if not self._refresh.isActive():
+            self._refresh.start()
+
+    def applyDeltas(self) -> None:
+        if self._loading.isVisible():
+            return
+
+        totals, data = {}, dict(self._data)
+        for version, rows in self._deltas:
+            for path, day, spent in rows:
+                time = aggregation.formatBucket(self._type, bucketKey(self._type, day))
+
+                if version > self._revisions["totals"]:
+                    totals[time] = totals.get(time, 0) + spent
+                if version > self._revisions["applications"] and time == self._time:
+                    data[path] = data.get(path, 0) + spent
+
+        if self._deltas:
+            self._revisions["totals"] = max(self._revisions["totals"], self._deltas[-1][0])
+            self._revisions["applications"] = max(self._revisions["applications"], self._deltas[-1][0])
+
+        self._deltas.clear()
+
+        if self._type != "all":
+            order = functools.partial(aggregation.parseBucket, self._type)
+
+            if self._statistic_choose.addData(totals, order) and self._time is None:
+                self.chooseDelta(time := max(totals, key=order))
+                self._statistic_choose.updateCurrent(time)
+
+                return
+
+        if self._time is not None and data != dict(self._data):
+            self.updateDelta((self._time, sorted(data.items(), reverse=True, key=lambda item: item[1])))
 
     def chooseDeltaType(self, type: str) -> None:
-        deltas, applications = timestamp.selectByDeltaType(type.lower(), SpentTime)
+        self._type = type.lower()
+        self._pages += 1
+
+        self._statistic_choose.updateData([])
+
+        self.request(
+            aggregation.selectPage, self._type, SpentTime, 0, self._page_size, callback=self.updateDeltas,
+            revision="totals"
+        )
+
+    def requestPage(self, offset: int) -> None:
+        pages = self._pages
 
-        self._applications = applications.copy()
+        def handle(deltas: list[tuple[str, int]]) -> None:
+            if pages == self._pages and offset == len(self._statistic_choose.keys()):
+                self._statistic_choose.appendData(deltas)
+            elif request == self._paging:
+                self._statistic_choose.setPending(False)
+
+        def fail(_: Exception) -> None:
+            if request == self._paging:
+                self._statistic_choose.setPending(False)
+
+        request = self._paging = self._reader.submit(
+            aggregation.selectTotals, self._type, SpentTime, offset, self._page_size, callback=handle, errback=fail
+        )
+
+    def updateDeltas(self, result: tuple[int, list[tuple[str, int]]]) -> None:
+        count, deltas = result
 
         self._statistic_choose.updateData([])
-        if type.lower() != "all":
-            self._statistic_choose.updateData(deltas)
+        if self._type != "all":
+            self._statistic_choose.updateData(deltas, count)
+
+        if not deltas:
+            return
 
         self.chooseDelta(deltas[0][0])
         self._statistic_choose.updateCurrent(
@@ -160,15 +481,14 @@ class QMain(QWidget):
         )
 
     def chooseDelta(self, time: str) -> None:
-        data = {}
-        for path, spent in self._applications[time]:  # noqa
-            if path not in data:
-                data[path] = 0
+        self.request(self.selectApplications, self._type, time, callback=self.updateDelta, revision="applications")
 
-            data[path] += spent
+    def updateDelta(self, result: tuple[str, list[tuple[str, int]]]) -> None:
+        time, data = result
+        self._time, self._data = time, data
 
-        self._statistic_view.setData(time, list(data.items()))
-        self._application_list.setData(list(data.items()))
+        self._statistic_view.setData(time, data)
+        self._application_list.setData(data)
 
     def resizeEvent(self, event: QResizeEvent) -> None:
         self._types_choose.resize(self.width() - 40, 40)
@@ -186,12 +506,20 @@ class QMain(QWidget):
         self._application_list.resize(self.width() - 10, 300)
         self._application_list.move(0, 400)
 
+        self._loading.resize(self.width(), 300)
+        self._loading.move(0, 100)
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
 
-    main = QWatcher()
+    session.setProfile(os.environ.get("TIMELY_PROFILE", "fast"))
+
+    main = QWatcher(
+        mode=os.environ.get("TIMELY_MODE", "poll"), sessions=bool(os.environ.get("TIMELY_SESSIONS")),
+        archive=bool(os.environ.get("TIMELY_ARCHIVE")), compress=os.environ.get("TIMELY_ARCHIVE") == "gz"
+    )
     main.start()
 
     sys.exit(app.exec())
@@ -1 +1,6 @@
-from .spenttime import SpentTime
+from .spenttime import Application, SpentTime
+from .metadata import ApplicationMetadata
+from .rollup import SpentTimeRollup, SpentTimeTotal
+from .sessions import SpentSession
+from .profile import PROFILES, StorageDatabase
+from .storage import migrate, record, snapshot, checkpoint, generation, archiveYear, archiveClosed
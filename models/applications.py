@@ -0,0 +1,57 @@
+import threading
+import time
+import typing
+
+from peewee import chunked, fn
+
+from .spenttime import Application, session
+
+_lock = threading.Lock()
+_identifiers = {}
+
+
+def identifiers(paths: typing.Iterable[str]) -> dict[str, int]:
+    paths = set(paths)
+
+    with _lock:
+        missing = [path for path in paths if path not in _identifiers]
+
+    if missing:
+        now = int(time.time())
+
+        with session.atomic():
+            for batch in chunked(missing, 100):
+                Application.insert_many(
+                    [(path, now, now) for path in batch],
+                    fields=[Application.path, Application.first_seen, Application.last_seen]
+                ).on_conflict_ignore().execute()
+
+            found = {}
+            for batch in chunked(missing, 100):
+                found.update(
+                    Application.select(Application.path, Application.id).where(Application.path.in_(batch)).tuples()
+                )
+
+        with _lock:
+            _identifiers.update(found)
+
+    with _lock:
+        return {path: _identifiers[path] for path in paths}
+
+
+def touch(identifiers: typing.Iterable[int]) -> None:
+    now = int(time.time())
+
+    for batch in chunked(list(identifiers), 100):
+        Application.update(
+            last_seen=fn.MAX(Application.last_seen, now)
+        ).where(Application.id.in_(batch)).execute()
+
+
+def setTitle(path: str, title: str) -> None:
+    Application.update(title=title).where(Application.path == path).execute()
+
+
+def clear() -> None:
+    with _lock:
+        _identifiers.clear()
@@ -0,0 +1,188 @@
+import datetime
+import functools
+import gzip
+import hashlib
+import operator
+import os
+import pathlib
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import typing
+
+from peewee import IntegerField, Model, OperationalError, TimestampField
+
+from .spenttime import SpentTime, session
+
+LIMIT = 9
+
+_lock = threading.Lock()
+
+
+class Archived(Model):
+    application = IntegerField(column_name="application_id")
+    timestamp = TimestampField()
+    spent = IntegerField()
+
+    class Meta:
+        database = session
+        table_name = "archived"
+        primary_key = False
+
+
+def schema(year: int) -> str:
+    return f"archive_{year}"
+
+
+def location(year: int, compressed: bool = False, database: str = None) -> str:
+    base, extension = os.path.splitext(database or session.database)
+
+    return f"{base}-{year}{extension}{'.gz' if compressed else ''}"
+
+
+def years(database: str = None) -> list[int]:
+    base, extension = os.path.splitext(database or session.database)
+    directory, name = os.path.split(base)
+
+    pattern = re.compile(rf"{re.escape(name)}-(\d{{4}}){re.escape(extension)}(?:\.gz)?")
+
+    try:
+        files = os.listdir(directory or ".")
+    except OSError:
+        return []
+
+    return sorted({int(match.group(1)) for file in files if (match := pattern.fullmatch(file))})
+
+
+def decompress(source: str, target: str) -> str:
+    with gzip.open(source, mode="rb") as input, open(f"{target}.tmp", mode="wb") as output:
+        shutil.copyfileobj(input, output)
+
+    os.replace(f"{target}.tmp", target)
+
+    return target
+
+
+def compress(source: str, target: str) -> str:
+    with open(source, mode="rb") as input, gzip.open(f"{target}.tmp", mode="wb") as output:
+        shutil.copyfileobj(input, output)
+
+    os.replace(f"{target}.tmp", target)
+
+    return target
+
+
+def local(year: int) -> str:
+    if os.path.exists(path := location(year)):
+        return path
+
+    compressed = location(year, True)
+    cached = os.path.join(
+        tempfile.gettempdir(), "timely",
+        f"{hashlib.sha1(os.path.abspath(compressed).encode('utf-8')).hexdigest()[:16]}-{os.path.basename(path)}"
+    )
+
+    with _lock:
+        if not os.path.exists(cached) or os.path.getmtime(cached) < os.path.getmtime(compressed):
+            os.makedirs(os.path.dirname(cached), exist_ok=True)
+
+            decompress(compressed, cached)
+
+    return cached
+
+
+@functools.cache
+def table(year: int) -> type[SpentTime]:
+    return type(f"SpentTime{year}", (SpentTime,), {
+        "__module__": __name__,
+        "Meta": type("Meta", (), {"schema": schema(year), "table_name": SpentTime._meta.table_name})
+    })
+
+
+def attached() -> set[str]:
+    return {name for _, name, _ in session.execute_sql("PRAGMA database_list").fetchall()}
+
+
+def attach(years: typing.Iterable[int]) -> list[int]:
+    names, years = attached(), list(years)
+
+    if len(years) > LIMIT:
+        raise ValueError(f"Can't attach more than {LIMIT} archives at once")
+
+    for name in names - {schema(year) for year in years}:
+        if name.startswith("archive_"):
+            try:
+                session.execute_sql(f"DETACH DATABASE {name}")
+            except OperationalError as _:
+                del _
+
+    for year in years:
+        if schema(year) not in names:
+            session.execute_sql(
+                f"ATTACH DATABASE ? AS {schema(year)}", (f"{pathlib.Path(local(year)).as_uri()}?mode=ro",)
+            )
+
+    return years
+
+
+def detach(year: int) -> None:
+    if schema(year) in attached():
+        session.execute_sql(f"DETACH DATABASE {schema(year)}")
+
+
+def span(start: datetime.date | None = None, end: datetime.date | None = None) -> list[int]:
+    return [
+        year for year in years()
+        if (start is None or datetime.date(year + 1, 1, 1) > start) and (end is None or datetime.date(year, 1, 1) < end)
+    ]
+
+
+def select(partition: type[Model], start: datetime.date | None = None, end: datetime.date | None = None):
+    query = partition.select(partition.application, partition.timestamp, partition.spent)
+
+    if start is not None:
+        query = query.where(partition.timestamp >= start)
+    if end is not None:
+        query = query.where(partition.timestamp < end)
+
+    return query
+
+
+def collect(years: list[int], start: datetime.date | None = None, end: datetime.date | None = None) -> None:
+    Archived.drop_table(safe=True)
+    Archived.create_table(temporary=True)
+
+    query = (
+        f"SELECT application_id, timestamp, spent FROM {SpentTime._meta.table_name} "
+        f"WHERE timestamp >= ? AND timestamp < ?"
+    )
+    bounds = (
+        -sys.maxsize if start is None else Archived.timestamp.db_value(start),
+        sys.maxsize if end is None else Archived.timestamp.db_value(end)
+    )
+
+    for year in years:
+        connection = sqlite3.connect(f"{pathlib.Path(local(year)).as_uri()}?mode=ro", uri=True)
+
+        try:
+            session.connection().executemany(
+                f"INSERT INTO {Archived._meta.table_name} VALUES (?, ?, ?)", connection.execute(query, bounds)
+            )
+        finally:
+            connection.close()
+
+
+def source(model: type[Model] = SpentTime, start: datetime.date | None = None, end: datetime.date | None = None):
+    if len(years := span(start, end)) > LIMIT:
+        collect(years, start, end)
+
+        partitions = [Archived]
+    else:
+        partitions = [table(year) for year in attach(years)]
+
+    return functools.reduce(
+        operator.add, [select(partition, start, end) for partition in [model] + partitions]
+    ).alias("rows")
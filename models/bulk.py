@@ -0,0 +1,16 @@
+import typing
+
+from peewee import Field, Model
+
+
+def upsert(model: type[Model], rows: typing.Sequence[tuple], fields: list[Field], conflict: list[Field],
+           update: dict) -> None:
+    if not rows:
+        return
+
+    sql, _ = model.insert_many(rows[:1], fields=fields).on_conflict(conflict_target=conflict, update=update).sql()
+
+    converters = [field.db_value for field in fields]
+    model._meta.database.cursor().executemany(
+        sql, [[convert(value) for convert, value in zip(converters, row)] for row in rows]
+    )
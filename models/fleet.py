@@ -0,0 +1,253 @@
+import concurrent.futures
+import csv
+import datetime
+import os
+import pathlib
+import sqlite3
+import tempfile
+import time
+import typing
+
+from peewee import CharField, DateField, FloatField, IntegerField, ForeignKeyField, Model, EXCLUDED
+
+from . import applications, archive, bulk, rollup
+from .spenttime import Application, SpentTime, session
+from .storage import migrate, writing
+
+DATABASE = "spent-time.db"
+OVERLAP = 86400
+
+
+class Source(Model):
+    label = CharField(unique=True)
+    path = CharField()
+    last_id = IntegerField(default=0)
+    last_timestamp = IntegerField(default=0)
+    merged_at = FloatField(default=0)
+    offset = IntegerField(default=0)
+
+    class Meta:
+        database = session
+        table_name = "sources"
+
+
+class FleetTime(Model):
+    source = ForeignKeyField(Source, index=False)
+    application = ForeignKeyField(Application)
+    day = DateField()
+    spent = IntegerField()
+
+    class Meta:
+        database = session
+        table_name = "fleettime"
+        indexes = (
+            (("source", "day", "application"), True),
+        )
+
+
+def label(path: str) -> str:
+    if os.path.basename(path) == DATABASE:
+        return os.path.basename(os.path.dirname(os.path.abspath(path)))
+
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _select(connection: sqlite3.Connection, schema: str) -> str:
+    columns = {column for _, column, *_ in connection.execute(f"PRAGMA {schema}.table_info(spenttime)")}
+
+    if "path" in columns:
+        return f"SELECT id, path, timestamp, spent FROM {schema}.spenttime"
+
+    return (
+        f"SELECT {schema}.spenttime.id, applications.path, {schema}.spenttime.timestamp, {schema}.spenttime.spent "
+        f"FROM {schema}.spenttime JOIN main.applications ON applications.id = {schema}.spenttime.application_id"
+    )
+
+
+def parseOffset(value: str) -> int:
+    hours, _, minutes = value.partition(":")
+
+    return (-1 if hours.startswith("-") else 1) * (abs(int(hours)) * 3600 + int(minutes or 0) * 60)
+
+
+def day(timestamp: int, offset: int = 0) -> datetime.date:
+    # Sources store local midnights; shifted by the source's UTC offset, the nearest UTC midnight is their day.
+    # The rounding tolerates an offset that is up to 12 hours off, so DST changes don't matter.
+    return datetime.datetime.fromtimestamp(
+        round((timestamp + offset) / 86400) * 86400, datetime.timezone.utc
+    ).date()
+
+
+def read(path: str, last_id: int = 0, last_timestamp: int = 0, merged_at: float = 0,
+         offset: int = 0) -> tuple[list[tuple[str, datetime.date, int]], int, int]:
+    connection = sqlite3.connect(f"{pathlib.Path(path).as_uri()}?mode=ro", uri=True)
+
+    rows = {}
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            query = f"{_select(connection, 'main')} WHERE spenttime.id > ? OR spenttime.timestamp >= ?"
+            for identifier, application, timestamp, spent in connection.execute(
+                    query, (last_id, last_timestamp - OVERLAP)):
+                key = application, day(timestamp, offset)
+                rows[key] = rows.get(key, 0) + spent
+
+                last_id, last_timestamp = max(last_id, identifier), max(last_timestamp, timestamp)
+
+            for year in archive.years(path):
+                if os.path.exists(location := archive.location(year, database=path)):
+                    if os.path.getmtime(location) <= merged_at:
+                        continue
+                elif os.path.getmtime(compressed := archive.location(year, True, path)) > merged_at:
+                    location = archive.decompress(compressed, os.path.join(directory, f"{year}.db"))
+                else:
+                    continue
+
+                connection.execute("ATTACH DATABASE ? AS archive", (f"{pathlib.Path(location).as_uri()}?mode=ro",))
+                for _, application, timestamp, spent in connection.execute(_select(connection, "archive")):
+                    key = application, day(timestamp, offset)
+                    rows[key] = rows.get(key, 0) + spent
+
+                connection.execute("DETACH DATABASE archive")
+        finally:
+            connection.close()
+
+    return [key + (spent,) for key, spent in rows.items()], last_id, last_timestamp
+
+
+def apply(source: Source, rows: list[tuple[str, datetime.date, int]], last_id: int, last_timestamp: int,
+          merged_at: float) -> int:
+    identifiers = applications.identifiers(path for path, _, _ in rows)
+    rows = [(source.id, identifiers[path], date, spent) for path, date, spent in rows]
+
+    with writing(), session.atomic():
+        existing = {}
+        if rows:
+            existing = {
+                (application, date): spent for application, date, spent in FleetTime.select(
+                    FleetTime.application, FleetTime.day, FleetTime.spent
+                ).where(
+                    (FleetTime.source == source.id) & (FleetTime.day >= min(row[2] for row in rows))
+                ).tuples().iterator()
+            }
+
+        deltas = [
+            (application, date, spent - existing.get((application, date), 0))
+            for _, application, date, spent in rows
+            if spent != existing.get((application, date), 0)
+        ]
+
+        bulk.upsert(
+            FleetTime, rows,
+            fields=[FleetTime.source, FleetTime.application, FleetTime.day, FleetTime.spent],
+            conflict=[FleetTime.source, FleetTime.day, FleetTime.application],
+            update={FleetTime.spent: EXCLUDED.spent}
+        )
+        bulk.upsert(
+            SpentTime, deltas,
+            fields=[SpentTime.application, SpentTime.timestamp, SpentTime.spent],
+            conflict=[SpentTime.application, SpentTime.timestamp],
+            update={SpentTime.spent: SpentTime.spent + EXCLUDED.spent}
+        )
+
+        applications.touch(identifiers.values())
+        rollup.update(deltas)
+
+        Source.update(
+            last_id=last_id, last_timestamp=last_timestamp, merged_at=merged_at
+        ).where(Source.id == source.id).execute()
+
+    return len(deltas)
+
+
+def reset(source: Source) -> None:
+    with writing(), session.atomic():
+        deltas = [
+            (application, date, -spent) for application, date, spent in FleetTime.select(
+                FleetTime.application, FleetTime.day, FleetTime.spent
+            ).where(FleetTime.source == source.id).tuples()
+        ]
+
+        bulk.upsert(
+            SpentTime, deltas,
+            fields=[SpentTime.application, SpentTime.timestamp, SpentTime.spent],
+            conflict=[SpentTime.application, SpentTime.timestamp],
+            update={SpentTime.spent: SpentTime.spent + EXCLUDED.spent}
+        )
+
+        rollup.update(deltas)
+
+        FleetTime.delete().where(FleetTime.source == source.id).execute()
+        Source.update(last_id=0, last_timestamp=0, merged_at=0).where(Source.id == source.id).execute()
+
+    source.last_id, source.last_timestamp, source.merged_at = 0, 0, 0
+
+
+def merge(paths: typing.Iterable[str | tuple[str, str] | tuple[str, str, int | None]], processes: int = None,
+          callback: typing.Callable[[str, int, int], None] = None) -> dict[str, int]:
+    labels = {}
+    for path in paths:
+        name, path, seconds = (path + (None,))[:3] if isinstance(path, tuple) else (label(path), path, None)
+        path = os.path.abspath(path)
+
+        if name in labels and labels[name][0] != path:
+            raise ValueError(f"Duplicate source label {name!r} for {labels[name][0]} and {path}")
+
+        labels[name] = path, seconds
+
+    migrate()
+    session.create_tables([Source, FleetTime])
+
+    if "offset" not in {column.name for column in session.get_columns(Source._meta.table_name)}:
+        session.execute_sql(f"ALTER TABLE {Source._meta.table_name} ADD COLUMN offset INTEGER NOT NULL DEFAULT 0")
+
+    sources = {}
+    for name, (path, seconds) in labels.items():
+        source, _ = Source.get_or_create(label=name, defaults={"path": path, "offset": seconds or 0})
+        if seconds is not None and seconds != source.offset:
+            reset(source)
+
+            source.offset = seconds
+
+        if source.path != path:
+            source.path = path
+
+        source.save()
+
+        sources[name] = source
+
+    started, output = time.time(), {}
+
+    with concurrent.futures.ProcessPoolExecutor(processes) as pool:
+        futures = {
+            pool.submit(read, source.path, source.last_id, source.last_timestamp, source.merged_at, source.offset): name
+            for name, source in sources.items()
+        }
+
+        for future in concurrent.futures.as_completed(futures):
+            name = futures[future]
+            rows, last_id, last_timestamp = future.result()
+
+            output[name] = apply(sources[name], rows, last_id, last_timestamp, started)
+
+            if callable(callback):
+                callback(name, len(rows), output[name])
+
+    return output
+
+
+def report(path: str) -> int:
+    count = 0
+
+    with open(path, mode="w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(("source", "path", "day", "spent"))
+
+        for row in FleetTime.select(
+            Source.label, Application.path, FleetTime.day, FleetTime.spent
+        ).join(Source).switch(FleetTime).join(Application).order_by(
+            Source.label, FleetTime.day, Application.path
+        ).tuples().iterator():
+            writer.writerow(row[:2] + (row[2].isoformat(), row[3]))
+            count += 1
+
+    return count
@@ -0,0 +1,13 @@
+from peewee import CharField, FloatField, IntegerField, Model
+
+from .spenttime import session
+
+
+class ApplicationMetadata(Model):
+    path = CharField(unique=True)
+    mtime = FloatField()
+    size = IntegerField()
+    title = CharField()
+
+    class Meta:
+        database = session
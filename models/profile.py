@@ -0,0 +1,73 @@
+import pathlib
+import sqlite3
+import threading
+
+from peewee import SqliteDatabase
+
+PROFILES = {
+    "durable": {
+        "journal_mode": "wal",
+        "synchronous": "full",
+        "cache_size": -8000,
+        "mmap_size": 0,
+        "busy_timeout": 5000,
+        "wal_autocheckpoint": 1000
+    },
+    "fast": {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "cache_size": -32000,
+        "mmap_size": 268435456,
+        "busy_timeout": 5000,
+        "wal_autocheckpoint": 1000,
+        "temp_store": "memory"
+    }
+}
+
+WRITE_PRAGMAS = ("journal_mode", "wal_autocheckpoint")
+
+
+class StorageDatabase(SqliteDatabase):
+    def __init__(self, database: str, profile: str = "fast", **kwargs: object) -> None:
+        self._local = threading.local()
+
+        super().__init__(database, pragmas=PROFILES[profile], **kwargs)
+
+    def setProfile(self, profile: str, database: str = None) -> None:
+        if not self.is_closed():
+            self.close()
+
+        self.init(database or self.database, pragmas=PROFILES[profile])
+
+    def setReadOnly(self, readonly: bool = True) -> None:
+        if not self.is_closed():
+            self.close()
+
+        self._local.readonly = readonly
+
+    def readOnly(self) -> bool:
+        return getattr(self._local, "readonly", False)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            f"{pathlib.Path(self.database).as_uri()}?mode={'ro' if self.readOnly() else 'rwc'}", timeout=self._timeout,
+            isolation_level=None, uri=True, **self.connect_params
+        )
+
+        try:
+            self._add_conn_hooks(connection)
+        except Exception:
+            connection.close()
+            raise
+
+        return connection
+
+    def _set_pragmas(self, connection: sqlite3.Connection) -> None:
+        cursor = connection.cursor()
+        for pragma, value in self._pragmas:
+            if self.readOnly() and pragma in WRITE_PRAGMAS:
+                continue
+
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+        cursor.close()
@@ -0,0 +1,109 @@
+import datetime
+
+from peewee import CharField, IntegerField, ForeignKeyField, Model, Select, Value, EXCLUDED, fn
+
+from . import archive, bulk
+from .spenttime import Application, SpentTime, session
+
+
+FORMATS = {
+    "year": "%Y",
+    "month": "%Y%m",
+    "day": "%Y%m%d"
+}
+
+
+class SpentTimeRollup(Model):
+    type = CharField()
+    bucket = IntegerField()
+    application = ForeignKeyField(Application, index=False)
+    spent = IntegerField()
+
+    class Meta:
+        database = session
+        indexes = (
+            (("type", "bucket", "application"), True),
+        )
+
+
+class SpentTimeTotal(Model):
+    type = CharField()
+    bucket = IntegerField()
+    spent = IntegerField()
+
+    class Meta:
+        database = session
+        indexes = (
+            (("type", "bucket"), True),
+        )
+
+
+def bucketKey(type: str, day: datetime.date) -> int:
+    if type == "year":
+        return day.year
+    if type == "month":
+        return (day.year * 100) + day.month
+    if type == "day":
+        return (day.year * 10000) + (day.month * 100) + day.day
+
+    return 0
+
+
+def bucketExpression(type: str, model: type[Model] = SpentTime):
+    if type not in FORMATS:
+        return Value(0)
+
+    return fn.strftime(FORMATS[type], model.timestamp, "unixepoch", "localtime").cast("INTEGER")
+
+
+def update(rows: list[tuple[int, datetime.date, int]]) -> None:
+    applications, totals = {}, {}
+    for application, day, spent in rows:
+        for type in ("all", "year", "month", "day"):
+            key = (type, bucketKey(type, day))
+
+            totals[key] = totals.get(key, 0) + spent
+            if type != "day":
+                applications[key + (application,)] = applications.get(key + (application,), 0) + spent
+
+    with session.atomic():
+        bulk.upsert(
+            SpentTimeRollup, [key + (spent,) for key, spent in applications.items()],
+            fields=[SpentTimeRollup.type, SpentTimeRollup.bucket, SpentTimeRollup.application, SpentTimeRollup.spent],
+            conflict=[SpentTimeRollup.type, SpentTimeRollup.bucket, SpentTimeRollup.application],
+            update={SpentTimeRollup.spent: SpentTimeRollup.spent + EXCLUDED.spent}
+        )
+
+        bulk.upsert(
+            SpentTimeTotal, [key + (spent,) for key, spent in totals.items()],
+            fields=[SpentTimeTotal.type, SpentTimeTotal.bucket, SpentTimeTotal.spent],
+            conflict=[SpentTimeTotal.type, SpentTimeTotal.bucket],
+            update={SpentTimeTotal.spent: SpentTimeTotal.spent + EXCLUDED.spent}
+        )
+
+
+def rebuild() -> None:
+    with session.atomic():
+        SpentTimeRollup.delete().execute()
+        SpentTimeTotal.delete().execute()
+
+        rows = archive.source()
+
+        for type in ("all", "year", "month", "day"):
+            bucket = bucketExpression(type, rows.c)
+
+            if type != "day":
+                SpentTimeRollup.insert_from(
+                    Select([rows], [
+                        Value(type), bucket, rows.c.application_id, fn.SUM(rows.c.spent)
+                    ]).group_by(bucket, rows.c.application_id),
+                    fields=[SpentTimeRollup.type, SpentTimeRollup.bucket, SpentTimeRollup.application,
+                            SpentTimeRollup.spent]
+                ).execute()
+
+            SpentTimeTotal.insert_from(
+                Select([rows], [
+                    Value(type), bucket, fn.SUM(rows.c.spent)
+                ]).group_by(bucket),
+                fields=[SpentTimeTotal.type, SpentTimeTotal.bucket, SpentTimeTotal.spent]
+            ).execute()
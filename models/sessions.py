@@ -0,0 +1,133 @@
+import datetime
+import math
+
+from peewee import CharField, FloatField, Model, OperationalError, chunked
+
+from .spenttime import session
+
+
+class SpentSession(Model):
+    path = CharField()
+    title = CharField()
+    start = FloatField()
+    end = FloatField()
+
+    class Meta:
+        database = session
+        table_name = "sessions"
+        indexes = (
+            (("start",), False),
+        )
+
+
+def createIndex() -> None:
+    session.execute_sql(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS sessions_index USING rtree_i32(id, start, end)"
+    )
+
+
+def create() -> bool:
+    try:
+        createIndex()
+    except OperationalError as _:
+        del _
+
+        return False
+
+    SpentSession.create_table()
+
+    return True
+
+
+def _index(since: int) -> None:
+    session.execute_sql(
+        "INSERT OR REPLACE INTO sessions_index (id, start, end) "
+        "SELECT id, CAST(start AS INTEGER), CAST(end AS INTEGER) + 1 FROM sessions WHERE id > ?", (since,)
+    )
+
+
+def append(rows: list[tuple[str, str, float, float]]) -> None:
+    if not rows:
+        return
+
+    with session.atomic():
+        since = session.execute_sql("SELECT IFNULL(MAX(id), 0) FROM sessions").fetchone()[0]
+
+        for batch in chunked(rows, 100):
+            SpentSession.insert_many(
+                batch, fields=[SpentSession.path, SpentSession.title, SpentSession.start, SpentSession.end]
+            ).execute()
+
+        _index(since)
+
+
+def selectRange(start: float, end: float) -> list[tuple[str, str, float, float]]:
+    cursor = session.execute_sql(
+        "SELECT sessions.path, sessions.title, MAX(sessions.start, ?), MIN(sessions.end, ?) "
+        "FROM sessions_index JOIN sessions ON sessions.id = sessions_index.id "
+        "WHERE sessions_index.end >= ? AND sessions_index.start <= ? AND sessions.end > ? AND sessions.start < ? "
+        "ORDER BY sessions.start",
+        (start, end, math.floor(start), math.ceil(end), start, end)
+    )
+
+    return list(cursor)
+
+
+def selectBuckets(start: float, end: float, size: float = 3600) -> dict[float, dict[str, float]]:
+    output = {}
+    for path, _, begin, finish in selectRange(start, end):
+        while begin < finish:
+            bucket = start + (((begin - start) // size) * size)
+            spent = min(finish, bucket + size) - begin
+
+            output.setdefault(bucket, {})
+            output[bucket][path] = output[bucket].get(path, 0) + spent
+
+            begin += spent
+
+    return output
+
+
+def selectDays(start: datetime.date, end: datetime.date) -> list[tuple[str, datetime.date, int]]:
+    output = {}
+    for path, _, begin, finish in selectRange(
+            datetime.datetime.combine(start, datetime.time()).timestamp(),
+            datetime.datetime.combine(end, datetime.time()).timestamp()):
+        while begin < finish:
+            day = datetime.date.fromtimestamp(begin)
+            midnight = datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time()).timestamp()
+
+            output[(path, day)] = output.get((path, day), 0) + min(finish, midnight) - begin
+
+            begin = midnight
+
+    return [(path, day, round(spent)) for (path, day), spent in output.items()]
+
+
+def compact(since: float = 0, gap: float = 1) -> int:
+    merged, previous = 0, None
+
+    with session.atomic():
+        query = SpentSession.select(
+            SpentSession.id, SpentSession.path, SpentSession.start, SpentSession.end
+        ).where(SpentSession.end >= since).order_by(SpentSession.start)
+
+        for identifier, path, start, end in list(query.tuples()):
+            if previous is None or previous[1] != path or start - previous[2] > gap:
+                previous = [identifier, path, end]
+
+                continue
+
+            previous[2] = max(previous[2], end)
+
+            SpentSession.update(end=previous[2]).where(SpentSession.id == previous[0]).execute()
+            SpentSession.delete_by_id(identifier)
+
+            session.execute_sql("DELETE FROM sessions_index WHERE id = ?", (identifier,))
+            session.execute_sql(
+                "UPDATE sessions_index SET end = ? WHERE id = ?", (math.floor(previous[2]) + 1, previous[0])
+            )
+
+            merged += 1
+
+    return merged
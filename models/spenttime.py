@@ -1,14 +1,31 @@
 from pathlib import Path
-from peewee import CharField, TimestampField, IntegerField, Model, SqliteDatabase
+from peewee import CharField, TimestampField, IntegerField, ForeignKeyField, Model
 
+from .profile import StorageDatabase
 
-session = SqliteDatabase(f"{Path.cwd()}\\files\\db\\spent-time.db")  # f"{Path.cwd()}\\files\\db\\spent-time.db"
+
+session = StorageDatabase(f"{Path.cwd()}\\files\\db\\spent-time.db")  # f"{Path.cwd()}\\files\\db\\spent-time.db"
+
+
+class Application(Model):
+    path = CharField(unique=True)
+    title = CharField(null=True)
+    first_seen = TimestampField()
+    last_seen = TimestampField()
+
+    class Meta:
+        database = session
+        table_name = "applications"
 
 
 class SpentTime(Model):
-    path = CharField()
+    application = ForeignKeyField(Application, index=False)
     timestamp = TimestampField()
     spent = IntegerField()
 
     class Meta:
         database = session
+        indexes = (
+            (("application", "timestamp"), True),
+            (("timestamp",), False),
+        )
@@ -0,0 +1,185 @@
+import contextlib
+import datetime
+import os
+import pathlib
+import stat
+import threading
+import typing
+
+from peewee import EXCLUDED, Model
+
+from . import applications, archive, bulk, rollup, sessions
+from .metadata import ApplicationMetadata
+from .rollup import SpentTimeRollup, SpentTimeTotal
+from .spenttime import Application, SpentTime, session
+
+lock = threading.RLock()
+_generation = 0
+
+
+def _legacy(model: type[Model]) -> bool:
+    return model.table_exists() and "path" in {
+        column.name for column in session.get_columns(model._meta.table_name)
+    }
+
+
+def migrate() -> None:
+    table, names = SpentTime._meta.table_name, Application._meta.table_name
+    legacy = _legacy(SpentTime)
+
+    applications.clear()
+
+    with session.atomic():
+        if legacy and not any(
+                index.unique and index.columns == ["path", "timestamp"] for index in session.get_indexes(table)):
+            session.execute_sql(
+                f"UPDATE {table} SET spent = ("
+                f"SELECT SUM(other.spent) FROM {table} AS other "
+                f"WHERE other.path = {table}.path AND other.timestamp = {table}.timestamp"
+                f") WHERE id IN (SELECT MIN(id) FROM {table} GROUP BY path, timestamp HAVING COUNT(*) > 1)"
+            )
+            session.execute_sql(
+                f"DELETE FROM {table} WHERE id NOT IN (SELECT MIN(id) FROM {table} GROUP BY path, timestamp)"
+            )
+
+        Application.create_table()
+        ApplicationMetadata.create_table()
+
+        if legacy:
+            metadata = ApplicationMetadata._meta.table_name
+
+            session.execute_sql(
+                f"INSERT OR IGNORE INTO {names} (path, title, first_seen, last_seen) "
+                f"SELECT path, (SELECT title FROM {metadata} WHERE {metadata}.path = {table}.path), "
+                f"MIN(timestamp), MAX(timestamp) FROM {table} GROUP BY path"
+            )
+
+            for index in session.get_indexes(table):
+                session.execute_sql(f"DROP INDEX IF EXISTS {index.name}")
+
+            session.execute_sql(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+
+        SpentTime.create_table()
+
+        if legacy:
+            session.execute_sql(
+                f"INSERT INTO {table} (id, application_id, timestamp, spent) "
+                f"SELECT legacy.id, {names}.id, legacy.timestamp, legacy.spent "
+                f"FROM {table}_legacy AS legacy JOIN {names} ON {names}.path = legacy.path"
+            )
+            session.execute_sql(f"DROP TABLE {table}_legacy")
+
+        if _legacy(SpentTimeRollup):
+            session.drop_tables([SpentTimeRollup, SpentTimeTotal])
+
+        if not SpentTimeRollup.table_exists() or not SpentTimeTotal.table_exists():
+            session.create_tables([SpentTimeRollup, SpentTimeTotal])
+
+            rollup.rebuild()
+
+    if legacy:
+        session.execute_sql("VACUUM")
+
+
+def generation() -> int:
+    return _generation
+
+
+@contextlib.contextmanager
+def writing() -> typing.Iterator[None]:
+    global _generation
+
+    with lock:
+        yield
+
+        _generation += 1
+
+
+def snapshot(function: typing.Callable, *args: object) -> tuple[int, object]:
+    with session.atomic():
+        with lock:
+            current = _generation
+            session.execute_sql("SELECT COUNT(*) FROM sqlite_master").fetchone()
+
+        return current, function(*args)
+
+
+def checkpoint(mode: str = "PASSIVE") -> tuple[int, int, int]:
+    return session.execute_sql(f"PRAGMA wal_checkpoint({mode})").fetchone()
+
+
+def record(rows: list[tuple[str, datetime.date, int]], spans: list[tuple[str, str, float, float]] = ()) -> None:
+    identifiers = applications.identifiers(path for path, _, _ in rows)
+    rows = [(identifiers[path], day, spent) for path, day, spent in rows]
+
+    with writing(), session.atomic():
+        bulk.upsert(
+            SpentTime, rows,
+            fields=[SpentTime.application, SpentTime.timestamp, SpentTime.spent],
+            conflict=[SpentTime.application, SpentTime.timestamp],
+            update={SpentTime.spent: SpentTime.spent + EXCLUDED.spent}
+        )
+
+        applications.touch(identifiers.values())
+        rollup.update(rows)
+        sessions.append(spans)
+
+
+def archiveYear(year: int, compress: bool = False) -> int:
+    if year >= datetime.date.today().year:
+        raise ValueError(f"Year {year} is not closed yet")
+
+    path, compressed = archive.location(year), archive.location(year, True)
+
+    if os.path.exists(compressed):
+        os.chmod(compressed, stat.S_IREAD | stat.S_IWRITE)
+
+        archive.decompress(compressed, path)
+        os.remove(compressed)
+
+    if os.path.exists(path):
+        os.chmod(path, stat.S_IREAD | stat.S_IWRITE)
+
+    archive.detach(year)
+    session.execute_sql(f"ATTACH DATABASE ? AS {archive.schema(year)}", (pathlib.Path(path).as_uri(),))
+
+    model, start, end = archive.table(year), datetime.date(year, 1, 1), datetime.date(year + 1, 1, 1)
+
+    try:
+        with writing(), session.atomic():
+            model.create_table()
+            model.insert_from(
+                SpentTime.select(
+                    SpentTime.application, SpentTime.timestamp, SpentTime.spent
+                ).where((SpentTime.timestamp >= start) & (SpentTime.timestamp < end)),
+                fields=[model.application, model.timestamp, model.spent]
+            ).on_conflict(
+                conflict_target=[model.application, model.timestamp],
+                update={model.spent: model.spent + EXCLUDED.spent}
+            ).execute()
+
+            moved = SpentTime.delete().where((SpentTime.timestamp >= start) & (SpentTime.timestamp < end)).execute()
+    finally:
+        archive.detach(year)
+
+    if compress:
+        archive.compress(path, compressed)
+        os.remove(path)
+
+        path = compressed
+
+    os.chmod(path, stat.S_IREAD)
+
+    return moved
+
+
+def archiveClosed(compress: bool = False) -> dict[int, int]:
+    bucket = rollup.bucketExpression("year")
+    years = [year for year, in SpentTime.select(bucket).distinct().tuples() if year < datetime.date.today().year]
+
+    moved = {year: archiveYear(year, compress) for year in years}
+
+    if moved:
+        session.execute_sql("VACUUM")
+
+    return moved
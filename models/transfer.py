@@ -0,0 +1,186 @@
+import array
+import csv
+import datetime
+import io
+import itertools
+import json
+import os
+import struct
+import sys
+import typing
+import zlib
+
+from peewee import fn
+
+from . import archive
+from .spenttime import Application, SpentTime
+from .storage import record
+
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".tcol": "columnar"
+}
+
+MAGIC = b"TIMELY\x01"
+BLOCK = struct.Struct("<II")
+
+
+def detect(path: str, format: str | None = None) -> str:
+    if format is None and (format := FORMATS.get(os.path.splitext(path)[1].lower())) is None:
+        raise ValueError(f"Unknown format for {path}")
+
+    if format not in FORMATS.values():
+        raise ValueError(f"Unknown format {format!r}")
+
+    return format
+
+
+def stream(start: datetime.date | None = None,
+           end: datetime.date | None = None) -> typing.Iterator[tuple[str, str, int]]:
+    rows = archive.source(SpentTime, start, end)
+
+    yield from Application.select(
+        Application.path, fn.date(rows.c.timestamp, "unixepoch", "localtime"), rows.c.spent
+    ).join(rows, on=(rows.c.application_id == Application.id)).tuples().iterator()
+
+
+def _array(code: str, data: bytes = b"") -> array.array:
+    values = array.array(code)
+    values.frombytes(data)
+
+    if sys.byteorder != "little":
+        values.byteswap()
+
+    return values
+
+
+def _bytes(values: array.array) -> bytes:
+    if sys.byteorder != "little":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+
+    return values.tobytes()
+
+
+def writeColumnar(file: typing.BinaryIO, rows: typing.Iterable[tuple[str, str, int]], size: int = 65536) -> int:
+    file.write(MAGIC)
+
+    rows, dictionary, count = iter(rows), {}, 0
+    for chunk in iter(lambda: list(itertools.islice(rows, size)), []):
+        added, paths, days, spent = [], _array("I"), _array("i"), _array("q")
+
+        for path, day, seconds in chunk:
+            if (identifier := dictionary.get(path)) is None:
+                identifier = dictionary[path] = len(dictionary)
+                added.append(path)
+
+            paths.append(identifier)
+            days.append(datetime.date.fromisoformat(day).toordinal())
+            spent.append(seconds)
+
+        payload = io.BytesIO()
+        payload.write(struct.pack("<I", len(added)))
+        for path in added:
+            payload.write(struct.pack("<H", len(encoded := path.encode("utf-8"))))
+            payload.write(encoded)
+
+        for column in (paths, days, spent):
+            payload.write(_bytes(column))
+
+        data = zlib.compress(payload.getvalue(), 6)
+
+        file.write(BLOCK.pack(len(chunk), len(data)))
+        file.write(data)
+
+        count += len(chunk)
+
+    return count
+
+
+def readColumnar(file: typing.BinaryIO) -> typing.Iterator[tuple[str, datetime.date, int]]:
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a columnar export")
+
+    dictionary = []
+    while header := file.read(BLOCK.size):
+        count, length = BLOCK.unpack(header)
+        payload = memoryview(zlib.decompress(file.read(length)))
+
+        added, = struct.unpack_from("<I", payload)
+        offset = 4
+
+        for _ in range(added):
+            size, = struct.unpack_from("<H", payload, offset)
+            dictionary.append(bytes(payload[offset + 2:offset + 2 + size]).decode("utf-8"))
+
+            offset += 2 + size
+
+        columns = []
+        for code, width in (("I", 4), ("i", 4), ("q", 8)):
+            columns.append(_array(code, payload[offset:offset + count * width]))
+
+            offset += count * width
+
+        for path, day, spent in zip(*columns):
+            yield dictionary[path], datetime.date.fromordinal(day), spent
+
+
+def exportRows(path: str, format: str | None = None, start: datetime.date | None = None,
+               end: datetime.date | None = None) -> int:
+    format, rows, count = detect(path, format), stream(start, end), 0
+
+    if format == "columnar":
+        with open(path, mode="wb") as file:
+            return writeColumnar(file, rows)
+
+    with open(path, mode="w", encoding="utf-8", newline="") as file:
+        if format == "csv":
+            writer = csv.writer(file)
+            writer.writerow(("path", "day", "spent"))
+
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            for application, day, spent in rows:
+                file.write(json.dumps({"path": application, "day": day, "spent": spent}, ensure_ascii=False) + "\n")
+                count += 1
+
+    return count
+
+
+def readRows(path: str, format: str | None = None) -> typing.Iterator[tuple[str, datetime.date, int]]:
+    format = detect(path, format)
+
+    if format == "columnar":
+        with open(path, mode="rb") as file:
+            yield from readColumnar(file)
+
+        return
+
+    with open(path, mode="r", encoding="utf-8", newline="") as file:
+        if format == "csv":
+            reader = csv.reader(file)
+            if next(reader, None) != ["path", "day", "spent"]:
+                raise ValueError(f"Unexpected header in {path}")
+
+            for application, day, spent in reader:
+                yield application, datetime.date.fromisoformat(day), int(spent)
+        else:
+            for line in file:
+                if line.strip():
+                    row = json.loads(line)
+
+                    yield row["path"], datetime.date.fromisoformat(row["day"]), int(row["spent"])
+
+
+def importRows(path: str, format: str | None = None, batch: int = 100000) -> int:
+    rows, count = readRows(path, format), 0
+
+    for chunk in iter(lambda: list(itertools.islice(rows, batch)), []):
+        record(chunk)
+
+        count += len(chunk)
+
+    return count
@@ -0,0 +1,19 @@
+import os
+import sys
+
+from .sampler import Sampler
+from .synthetic import Sample, SyntheticSampler
+
+
+def getSampler() -> Sampler:
+    if trace := os.environ.get("TIMELY_TRACE"):
+        return SyntheticSampler.load(trace, realtime=True)
+
+    if sys.platform == "win32":
+        from .windows import WindowsSampler
+
+        return WindowsSampler()
+
+    from .linux import LinuxSampler
+
+    return LinuxSampler()
@@ -0,0 +1,99 @@
+import os
+import shutil
+import subprocess
+import threading
+import typing
+
+from Xlib import X, display, error
+
+from .sampler import Sampler
+
+
+class LinuxSampler(Sampler):
+    def __init__(self, name: str = None) -> None:
+        self._name = name
+        self._display = display.Display(name)
+        self._root = self._display.screen().root
+
+        self._active = self._display.intern_atom("_NET_ACTIVE_WINDOW")
+        self._title = self._display.intern_atom("_NET_WM_NAME")
+        self._pid = self._display.intern_atom("_NET_WM_PID")
+        self._utf8 = self._display.intern_atom("UTF8_STRING")
+
+        self._screensaver = self._display.has_extension("MIT-SCREEN-SAVER")
+        self._playerctl = shutil.which("playerctl")
+
+        self._listening = False
+
+    def _property(self, window, atom: int, type: int = X.AnyPropertyType) -> object:
+        try:
+            value = window.get_full_property(atom, type)
+        except error.XError:
+            return None
+
+        return value.value if value else None
+
+    def getActiveWindow(self) -> object:
+        value = self._property(self._root, self._active)
+        if value is None or not len(value) or not value[0]:
+            return None
+
+        return self._display.create_resource_object("window", value[0])
+
+    def getCurrentApplication(self) -> tuple[str, str]:
+        if (window := self.getActiveWindow()) is None:
+            return "", ""
+
+        title, pid, path = self._property(window, self._title, self._utf8), self._property(window, self._pid), ""
+        if isinstance(title, bytes):
+            title = title.decode("utf-8", errors="replace")
+
+        if pid is not None and len(pid):
+            try:
+                path = os.readlink(f"/proc/{pid[0]}/exe")
+            except OSError as _:
+                del _
+
+        return title or "", path
+
+    def getIdleDuration(self) -> float:
+        if not self._screensaver:
+            return 0.0
+
+        return self._root.screensaver_query_info().idle / 1000
+
+    def mediaIsPlaying(self) -> bool:
+        if self._playerctl is None:
+            return False
+
+        try:
+            status = subprocess.run(
+                [self._playerctl, "status"], capture_output=True, text=True, timeout=1
+            ).stdout
+        except (OSError, subprocess.SubprocessError):
+            return False
+
+        return status.strip() == "Playing"
+
+    def _listen(self, callback: typing.Callable[[], None]) -> None:
+        connection = display.Display(self._name)
+        connection.screen().root.change_attributes(event_mask=X.PropertyChangeMask)
+
+        active = connection.intern_atom("_NET_ACTIVE_WINDOW")
+        while self._listening:
+            event = connection.next_event()
+            if event.type == X.PropertyNotify and event.atom == active and self._listening:
+                callback()
+
+        connection.close()
+
+    def subscribe(self, callback: typing.Callable[[], None]) -> bool:
+        self.unsubscribe()
+
+        self._listening = True
+        threading.Thread(target=self._listen, args=(callback,), daemon=True).start()
+
+        return True
+
+    def unsubscribe(self) -> None:
+        self._listening = False
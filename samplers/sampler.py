@@ -0,0 +1,22 @@
+import time
+import typing
+
+
+class Sampler(object):
+    def now(self) -> float:
+        return time.time()
+
+    def getCurrentApplication(self) -> tuple[str, str]:
+        raise NotImplementedError
+
+    def getIdleDuration(self) -> float:
+        raise NotImplementedError
+
+    def mediaIsPlaying(self) -> bool:
+        raise NotImplementedError
+
+    def subscribe(self, callback: typing.Callable[[], None]) -> bool:
+        return False
+
+    def unsubscribe(self) -> None:
+        pass
@@ -0,0 +1,96 @@
+import bisect
+import json
+import time
+import typing
+
+from .sampler import Sampler
+
+
+class Sample(typing.NamedTuple):
+    time: float
+    title: str
+    path: str
+    idle: float = 0.0
+    media: bool = False
+
+
+class SyntheticSampler(Sampler):
+    def __init__(self, trace: list[Sample], realtime: bool = False) -> None:
+        self._trace = sorted(trace)
+        self._times = [sample.time for sample in self._trace]
+
+        self._realtime = realtime
+        self._started = time.time()
+        self._clock = self._times[0] if self._times else 0.0
+
+        self._callback = None
+
+    @classmethod
+    def load(cls, path: str, realtime: bool = False) -> "SyntheticSampler":
+        with open(path, mode="r", encoding="utf-8") as file:
+            return cls([Sample(*json.loads(line)) for line in file if line.strip()], realtime)
+
+    @classmethod
+    def record(cls, sampler: Sampler, count: int, interval: float = 1) -> "SyntheticSampler":
+        trace = []
+        for _ in range(count):
+            title, path = sampler.getCurrentApplication()
+            trace.append(
+                Sample(sampler.now(), title, path, sampler.getIdleDuration(), sampler.mediaIsPlaying())
+            )
+
+            time.sleep(interval)
+
+        return cls(trace)
+
+    def dump(self, path: str) -> None:
+        with open(path, mode="w", encoding="utf-8") as file:
+            for sample in self._trace:
+                file.write(json.dumps(list(sample)) + "\n")
+
+    def now(self) -> float:
+        if self._realtime:
+            return self._clock + (time.time() - self._started)
+
+        return self._clock
+
+    def advance(self, seconds: float = 1) -> None:
+        target = self._clock + seconds
+
+        if self._callback is not None:
+            index = bisect.bisect_right(self._times, self._clock)
+            while index < len(self._times) and self._times[index] <= target:
+                before = self.current()
+
+                self._clock = self._times[index]
+                if (self.current().title, self.current().path) != (before.title, before.path):
+                    self._callback()
+
+                index += 1
+
+        self._clock = target
+
+    def subscribe(self, callback: typing.Callable[[], None]) -> bool:
+        self._callback = callback
+
+        return True
+
+    def unsubscribe(self) -> None:
+        self._callback = None
+
+    def finished(self) -> bool:
+        return not self._trace or self.now() > self._times[-1]
+
+    def current(self) -> Sample:
+        return self._trace[max(bisect.bisect_right(self._times, self.now()) - 1, 0)]
+
+    def getCurrentApplication(self) -> tuple[str, str]:
+        sample = self.current()
+
+        return sample.title, sample.path
+
+    def getIdleDuration(self) -> float:
+        return self.current().idle
+
+    def mediaIsPlaying(self) -> bool:
+        return self.current().media
@@ -0,0 +1,67 @@
+import ctypes
+import typing
+from ctypes import wintypes
+
+import win32api
+import win32gui
+import win32process
+
+from timely.utils import afk, sound
+
+from .sampler import Sampler
+
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+
+WinEventProcedure = ctypes.WINFUNCTYPE(
+    None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND, wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+)
+
+
+class WindowsSampler(Sampler):
+    def __init__(self) -> None:
+        self._hook = None
+        self._procedure = None
+
+        sound.watcher.start()
+
+    @staticmethod
+    def getApplicationPath(hwnd: int) -> str:
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        process = win32api.OpenProcess(0x0400, False, pid)
+
+        try:
+            location = win32process.GetModuleFileNameEx(process, 0)
+        finally:
+            win32api.CloseHandle(process)
+
+        return location or ""
+
+    def getCurrentApplication(self) -> tuple[str, str]:
+        hwnd = win32gui.GetForegroundWindow()
+
+        return win32gui.GetWindowText(hwnd), self.getApplicationPath(hwnd)
+
+    def getIdleDuration(self) -> float:
+        return afk.getIdleDuration()
+
+    def mediaIsPlaying(self) -> bool:
+        return sound.mediaIsPlaying()
+
+    def subscribe(self, callback: typing.Callable[[], None]) -> bool:
+        self.unsubscribe()
+
+        self._procedure = WinEventProcedure(lambda *_: callback())
+        self._hook = ctypes.windll.user32.SetWinEventHook(
+            EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, 0, self._procedure, 0, 0, WINEVENT_OUTOFCONTEXT
+        )
+
+        return bool(self._hook)
+
+    def unsubscribe(self) -> None:
+        if self._hook:
+            ctypes.windll.user32.UnhookWinEvent(self._hook)
+
+        self._hook = None
+        self._procedure = None
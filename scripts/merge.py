@@ -0,0 +1,63 @@
+import argparse
+import glob
+import os
+import re
+import time
+
+from timely.models import fleet
+from timely.models.spenttime import session
+
+
+def sources(arguments: list[str]) -> list[tuple[str, str, int | None]]:
+    output = []
+    for argument in arguments:
+        seconds = None
+        if (match := re.fullmatch(r"(.+)@([+-]?\d{1,2}(?::\d{2})?)", argument)) and not os.path.exists(argument):
+            argument, seconds = match.group(1), fleet.parseOffset(match.group(2))
+
+        if os.path.isdir(argument):
+            for path in sorted(glob.glob(os.path.join(argument, "**", fleet.DATABASE), recursive=True)):
+                name = os.path.relpath(os.path.dirname(path), argument)
+
+                output.append((
+                    name.replace(os.sep, "/") if name != os.curdir else fleet.label(path), os.path.abspath(path),
+                    seconds
+                ))
+        elif "=" in argument and not os.path.exists(argument):
+            name, path = argument.split("=", 1)
+            output.append((name, os.path.abspath(path), seconds))
+        else:
+            output.append((fleet.label(argument), os.path.abspath(argument), seconds))
+
+    return output
+
+
+def merge(target: str, paths: list[tuple[str, str, int | None]], processes: int = None, report: str = None) -> None:
+    def progress(name: str, rows: int, changed: int) -> None:
+        print(f"{name}: {rows} rows read, {changed} counters changed")
+
+    start = time.perf_counter()
+    output = fleet.merge(paths, processes, progress)
+
+    elapsed = time.perf_counter() - start
+    print(f"merged {len(output)} sources into {target} in {elapsed:.3f}s ({len(output) / max(elapsed, 1e-9):.1f} sources/s)")
+
+    if report:
+        print(f"wrote {fleet.report(report)} rows to {report}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("target")
+    parser.add_argument(
+        "sources", nargs="+", help="database files, directories or label=path pairs, optionally suffixed with @<UTC offset>"
+    )
+    parser.add_argument("--processes", type=int)
+    parser.add_argument("--report")
+    parser.add_argument("--profile", default="fast")
+
+    arguments = parser.parse_args()
+
+    session.setProfile(arguments.profile, os.path.abspath(arguments.target))
+
+    merge(arguments.target, sources(arguments.sources), arguments.processes, arguments.report)
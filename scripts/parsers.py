@@ -0,0 +1,120 @@
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+
+from timely.utils import localization, theme, tokenizer
+
+
+def _legacy_quotes(string: str) -> list[int]:
+    output = []
+    for match in re.finditer(r"\"(\\.|[^\"\\])*\"", string):
+        output.extend(list(range(match.start(), match.end() + 1)))
+
+    return output
+
+
+def _legacy_assignment(string: str) -> bool:
+    if (index := string.find("=")) != -1:
+        return index not in _legacy_quotes(string)
+
+    return False
+
+
+def _legacy_string(string: str) -> str:
+    return "".join(match.group(0)[1:-1] for match in re.finditer(r"\"(\\.|[^\"\\])*\"", string))
+
+
+def legacyLocale(lines: list[str]) -> dict[str, str]:
+    values = []
+    for line in lines:
+        if not line.strip() or line.strip().startswith("#"):
+            continue
+
+        if _legacy_assignment(line):
+            match = re.findall(r"^\s*([A-Za-z0-9_.]*\w*)\s*=\s*(.*)", line)[0]
+            values.append((match[0], _legacy_string(match[1])))
+
+        if not _legacy_assignment(line) and values:
+            values[-1] = (values[-1][0], values[-1][1] + _legacy_string(line))
+
+    return {key: value for key, value in values}
+
+
+def legacyTheme(lines: list[str]) -> dict[str, str]:
+    output = {}
+    for line in lines:
+        line = line.strip()
+        if line.startswith("//") or not line:
+            continue
+
+        output[line.split("=", 1)[0]] = line.split("=", 1)[1]
+
+    return output
+
+
+def generate(path: str, entries: int, kind: str) -> None:
+    random.seed(entries)
+
+    with open(path, mode="w", encoding="utf-8") as file:
+        for index in range(entries):
+            if kind == "theme":
+                file.write(f"// Section {index}\n\ncolor{index}=#{random.randrange(1 << 24):06x}\n")
+
+                continue
+
+            file.write(f"# Entry {index}\n")
+            file.write(f"section{index % 50}.key{index} = \"Value {index} with \\\"quotes\\\" = sign\"\n")
+
+            for line in range(random.randrange(3)):
+                file.write(f"    \" continued {line}\"\n")
+
+
+def measure(function: callable, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def benchmark(entries: int = 20000, repeat: int = 5) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for kind, legacy, tokenize, parse in (("locale", legacyLocale, localization._parse, localization.loads),
+                                              ("theme", legacyTheme, theme._parse, theme.parse)):
+            path = os.path.join(directory, f"generated.{'lang' if kind == 'locale' else 'theme'}")
+            generate(path, entries, kind)
+
+            with open(path, mode="r", encoding="utf-8") as file:
+                text = file.read()
+
+            lines = text.splitlines(keepends=True)
+
+            if legacy(lines) != parse(path):
+                raise AssertionError(f"{kind} parsers disagree")
+
+            def cold() -> None:
+                os.remove(tokenizer._cache(path))
+                parse(path)
+
+            print(
+                f"{kind}: {entries} entries, {os.path.getsize(path) // 1024} KiB | "
+                f"legacy {measure(lambda: legacy(lines), repeat) * 1000:.1f} ms | "
+                f"tokenizer {measure(lambda: tokenize(text), repeat) * 1000:.1f} ms | "
+                f"uncached load {measure(cold, repeat) * 1000:.1f} ms | "
+                f"cached {measure(lambda: parse(path), repeat) * 1000:.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+
+    arguments = parser.parse_args()
+
+    benchmark(arguments.entries, arguments.repeat)
@@ -0,0 +1,50 @@
+import argparse
+import time
+
+from timely.models import migrate
+from timely.samplers import SyntheticSampler
+from timely.utils.tracker import Tracker
+
+
+def replay(path: str, flush_interval: int = 60, mode: str = "poll", heartbeat_interval: int = 30,
+           sessions: bool = False) -> None:
+    sampler = SyntheticSampler.load(path)
+    tracker = Tracker(sampler, sessions=sessions)
+
+    migrate()
+
+    step = 1
+    if mode == "event" and sampler.subscribe(tracker.focus):
+        step = heartbeat_interval
+        tracker.focus()
+
+    ticks, start = 0, time.perf_counter()
+    while not sampler.finished():
+        if step == 1:
+            rolled = tracker.tick()
+        else:
+            rolled = tracker.heartbeat()
+
+        sampler.advance(step)
+
+        ticks += 1
+        if rolled or (ticks * step) % flush_interval < step:
+            tracker.flush()
+
+    tracker.flush()
+
+    elapsed = time.perf_counter() - start
+    print(f"{ticks} ticks in {elapsed:.3f}s ({ticks / elapsed:.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("trace")
+    parser.add_argument("--flush-interval", type=int, default=60)
+    parser.add_argument("--mode", choices=("poll", "event"), default="poll")
+    parser.add_argument("--heartbeat-interval", type=int, default=30)
+    parser.add_argument("--sessions", action="store_true")
+
+    arguments = parser.parse_args()
+
+    replay(arguments.trace, arguments.flush_interval, arguments.mode, arguments.heartbeat_interval, arguments.sessions)
@@ -0,0 +1,56 @@
+import argparse
+import sys
+import time
+
+from timely.utils.smoothscroll import QSmoothScroll
+
+from PySide6.QtCore import Qt, QPoint, QPointF
+from PySide6.QtGui import QWheelEvent
+from PySide6.QtWidgets import QApplication, QScrollArea, QWidget
+
+
+def wheel(delta: int) -> QWheelEvent:
+    return QWheelEvent(
+        QPointF(10, 10), QPointF(10, 10), QPoint(0, 0), QPoint(0, delta), Qt.MouseButton.NoButton,
+        Qt.KeyboardModifier.NoModifier, Qt.ScrollPhase.NoScrollPhase, False
+    )
+
+
+def benchmark(bursts: list[int], frames: int = 1000) -> None:
+    area = QScrollArea()
+
+    widget = QWidget()
+    widget.setFixedSize(400, 10 ** 7)
+
+    area.setWidget(widget)
+    area.resize(400, 300)
+
+    smooth = QSmoothScroll(area)
+    smooth.setSmoothMode(QSmoothScroll.Type.Cosine)
+
+    for burst in bursts:
+        elapsed = 0.0
+        for frame in range(frames):
+            if frame % 15 == 0:
+                area.verticalScrollBar().setValue(10 ** 6)
+
+                for _ in range(burst):
+                    smooth.wheelEvent(wheel(-120))
+
+            start = time.perf_counter()
+            smooth.smoothMode()
+            elapsed += time.perf_counter() - start
+
+        print(f"burst {burst:>5}: {elapsed / frames * 1e6:.2f} us/frame")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bursts", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--frames", type=int, default=1000)
+
+    arguments = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    benchmark(arguments.bursts, arguments.frames)
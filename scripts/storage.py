@@ -0,0 +1,81 @@
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import threading
+import time
+
+from timely.models import PROFILES, SpentTime, migrate, record, snapshot, checkpoint
+from timely.models.spenttime import session
+from timely.utils import aggregation
+
+
+def reader(stop: threading.Event, reads: list[float]) -> None:
+    session.setReadOnly(True)
+
+    while not stop.is_set():
+        start = time.perf_counter()
+        snapshot(aggregation.selectPage, "day", SpentTime, 0, 100)
+        reads.append(time.perf_counter() - start)
+
+    session.close()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    return sorted(values)[min(int(len(values) * fraction), len(values) - 1)] if values else 0.0
+
+
+def benchmark(commits: int = 2000, rows: int = 5, readers: int = 2) -> None:
+    for profile in PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            session.setProfile(profile, os.path.join(directory, "spent-time.db"))
+            migrate()
+
+            random.seed(commits)
+            day = datetime.date(2024, 1, 1)
+
+            stop, reads = threading.Event(), []
+            threads = [threading.Thread(target=reader, args=(stop, reads)) for _ in range(readers)]
+            for thread in threads:
+                thread.start()
+
+            writes, start = [], time.perf_counter()
+            for commit in range(commits):
+                batch = [
+                    (f"C:\\Programs\\app{random.randrange(50)}.exe", day + datetime.timedelta(days=commit // 60),
+                     random.randrange(1, 60)) for _ in range(rows)
+                ]
+
+                begin = time.perf_counter()
+                record(batch)
+                writes.append(time.perf_counter() - begin)
+
+            elapsed = time.perf_counter() - start
+
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+            begin = time.perf_counter()
+            checkpoint("TRUNCATE")
+
+            print(
+                f"{profile:>8}: {commits / elapsed:.0f} commits/s | "
+                f"write mean {sum(writes) / len(writes) * 1000:.2f} ms, p99 {percentile(writes, 0.99) * 1000:.2f} ms | "
+                f"{len(reads) / elapsed:.0f} reads/s, p99 {percentile(reads, 0.99) * 1000:.2f} ms | "
+                f"checkpoint {(time.perf_counter() - begin) * 1000:.1f} ms"
+            )
+
+            session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commits", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=5)
+    parser.add_argument("--readers", type=int, default=2)
+
+    arguments = parser.parse_args()
+
+    benchmark(arguments.commits, arguments.rows, arguments.readers)
@@ -0,0 +1,52 @@
+import argparse
+import datetime
+import time
+
+from timely.models import migrate, transfer
+from timely.models.spenttime import session
+
+
+def export(path: str, format: str = None, start: datetime.date = None, end: datetime.date = None) -> None:
+    begin = time.perf_counter()
+    count = transfer.exportRows(path, format, start, end)
+
+    elapsed = time.perf_counter() - begin
+    print(f"exported {count} rows to {path} in {elapsed:.3f}s ({count / max(elapsed, 1e-9):.0f} rows/s)")
+
+
+def load(path: str, format: str = None, batch: int = 100000) -> None:
+    migrate()
+
+    begin = time.perf_counter()
+    count = transfer.importRows(path, format, batch)
+
+    elapsed = time.perf_counter() - begin
+    print(f"imported {count} rows from {path} in {elapsed:.3f}s ({count / max(elapsed, 1e-9):.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database")
+    parser.add_argument("--profile", default="fast")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    exporter = commands.add_parser("export")
+    exporter.add_argument("path")
+    exporter.add_argument("--format", choices=transfer.FORMATS.values())
+    exporter.add_argument("--start", type=datetime.date.fromisoformat)
+    exporter.add_argument("--end", type=datetime.date.fromisoformat)
+
+    importer = commands.add_parser("import")
+    importer.add_argument("path")
+    importer.add_argument("--format", choices=transfer.FORMATS.values())
+    importer.add_argument("--batch", type=int, default=100000)
+
+    arguments = parser.parse_args()
+
+    session.setProfile(arguments.profile, arguments.database)
+
+    if arguments.command == "export":
+        export(arguments.path, arguments.format, arguments.start, arguments.end)
+    else:
+        load(arguments.path, arguments.format, arguments.batch)
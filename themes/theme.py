@@ -1,3 +1,7 @@
+import string
+import typing
+import weakref
+
 from timely.utils import theme
 
 
@@ -5,49 +9,135 @@ class QTheme(object):
     _last = 1
     _data = {}
 
+    _subscribers = []
+    _widgets = []
+
     changed = []
 
+    fragments = {
+        "application": "QLabel {{ color: {labelColor}; }} "
+                       "QScrollArea {{ border: none; background: transparent; }} "
+                       "QScrollBar:vertical {{ background-color: {scrollbarBackground}; width: 6px; "
+                       "margin: 1px 0px 11px 0px; border-radius: 3px; "
+                       "border: 1px transparent {scrollbarBackground}; }} "
+                       "QScrollBar::handle:vertical {{ background-color: {scrollbarHandleColor}; "
+                       "min-height: 6px; border-radius: 3px; }} "
+                       "QScrollBar::sub-line:vertical {{ background-color: transparent; color: transparent; }} "
+                       "QScrollBar::add-line:vertical {{ background-color: transparent; color: transparent; }} "
+                       "QScrollBar::up-arrow:vertical, QScrollBar::down-arrow:vertical {{ background: none; }} "
+                       "QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {{ background: none; }} "
+                       "QPushButton {{ background: transparent; color: {labelColor}; font-weight: bold; }} "
+                       "QMenu {{ background: {contextMenuBackground}; color: {contextMenuItemColor}; "
+                       "border-radius: 5px; font-size: 10pt; padding: 3px; }} "
+                       "QMenu::item {{ background: transparent; border: none; padding: 3px 15px 3px 15px; }} "
+                       "QMenu::item:selected {{ background-color: {contextMenuSelectedBackground}; "
+                       "border-radius: 3px; }} QMenu::icon {{ padding-left: 5px; }}",
+        "QMain": "QMain, QStatisticView {{ background: {background}; }}",
+        "QChooseData": "QChooseData {{ background: {chooseData}; }}",
+        "QStatisticChooseBackground": "QStatisticChooseBackground {{ background: {statisticChoose}; "
+                                      "border-radius: 5px; }}",
+        "QApplicationListFrame": "QApplicationListFrame {{ background: {applicationList}; }}",
+        "QShareButton": "QShareButton {{ background: {shareButtonColor}; color: {labelColor}; "
+                        "font-weight: bold; border: none; border-radius: 5px; margin: 5px; }} "
+                        "QShareButton:hover {{ background: {shareButtonHoverColor}; }}",
+        "QChooseFrame": "QChooseFrame {{ background: {chooseDeltaTypeColor}; border-radius: 6px; margin: 1px; }}"
+    }
+
     @classmethod
-    def pie(cls) -> str:
+    def pieKey(cls) -> str:
         if cls._last == 5:
             cls._last = 0
         cls._last += 1
 
-        return cls.get(f"pieGraphColor{cls._last}")
+        return f"pieGraphColor{cls._last}"
+
+    @classmethod
+    def pie(cls) -> str:
+        return cls.get(cls.pieKey())
 
     @classmethod
     def get(cls, key: str) -> str:
         return cls._data.get(key, "")
 
     @classmethod
-    def load(cls, path: str) -> str:
-        cls._data = theme.parse(path)
+    def keys(cls, name: str) -> set[str]:
+        return {key for _, key, _, _ in string.Formatter().parse(cls.fragments[name]) if key}
+
+    @classmethod
+    def fragment(cls, name: str) -> str:
+        return cls.fragments[name].format_map(
+            {key: cls.get(key) for key in cls.keys(name)}
+        )
+
+    @classmethod
+    def stylesheet(cls) -> str:
+        return cls.fragment("application")
+
+    @classmethod
+    def style(cls, widget: typing.Any, name: str = None) -> None:
+        name = name or type(widget).__name__
+
+        cls._widgets.append((weakref.ref(widget), name))
+
+        widget.setStyleSheet(cls.fragment(name))
+
+    @classmethod
+    def subscribe(cls, keys: typing.Iterable[str], function: typing.Callable) -> None:
+        reference = weakref.WeakMethod(function) if hasattr(function, "__self__") else (lambda: function)
+
+        cls._subscribers.append((set(keys), reference))
+
+    @classmethod
+    def update(cls, data: dict[str, str]) -> set[str]:
+        changed = {key for key in data.keys() | cls._data.keys() if data.get(key) != cls._data.get(key)}
+        if not changed:
+            return changed
+
+        cls._data = data
 
         for function in cls.changed:
             function()
 
-        return f"QMain, QStatisticView {{ background: {cls.get('background')}; }} " \
-               f"QLabel {{ color: {cls.get('labelColor')}; }} " \
-               f"QChooseData {{ background: {cls.get('chooseData')}; }} " \
-               f"QStatisticChooseBackground {{ background: {cls.get('statisticChoose')}; border-radius: 5px; }} " \
-               f"QApplicationListFrame {{ background: {cls.get('applicationList')}; }} " \
-               f"QScrollArea {{ border: none; background: transparent; }} " \
-               f"QScrollBar:vertical {{ background-color: {cls.get('scrollbarBackground')}; width: 6px; " \
-               f"margin: 1px 0px 11px 0px; border-radius: 3px; " \
-               f"border: 1px transparent {cls.get('scrollbarBackground')}; }} " \
-               f"QScrollBar::handle:vertical {{ background-color: {cls.get('scrollbarHandleColor')}; " \
-               f"min-height: 6px; border-radius: 3px; }} " \
-               f"QScrollBar::sub-line:vertical {{ background-color: transparent; color: transparent; }} " \
-               f"QScrollBar::add-line:vertical {{ background-color: transparent; color: transparent; }} " \
-               f"QScrollBar::up-arrow:vertical, QScrollBar::down-arrow:vertical {{ background: none; }} " \
-               f"QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {{ background: none; }} " \
-               f"QPushButton {{ background: transparent; color: {cls.get('labelColor')}; font-weight: bold; }}" \
-               f"QShareButton {{ background: {cls.get('shareButtonColor')}; color: {cls.get('labelColor')}; " \
-               f"font-weight: bold; border: none; border-radius: 5px; margin: 5px; }}" \
-               f"QShareButton:hover {{ background: {cls.get('shareButtonHoverColor')}; }}" \
-               f"QChooseFrame {{ background: {cls.get('chooseDeltaTypeColor')}; border-radius: 6px; margin: 1px; }}" \
-               f"QMenu {{ background: {cls.get('contextMenuBackground')}; color: {cls.get('contextMenuItemColor')}; " \
-               f"border-radius: 5px; font-size: 10pt; padding: 3px; }} " \
-               f"QMenu::item {{ background: transparent; border: none; padding: 3px 15px 3px 15px; }} " \
-               f"QMenu::item:selected {{ background-color: {cls.get('contextMenuSelectedBackground')}; " \
-               f"border-radius: 3px; }} QMenu::icon {{ padding-left: 5px; }}"
+        widgets = []
+        for reference, name in cls._widgets:
+            if (widget := reference()) is None:
+                continue
+
+            try:
+                if changed & cls.keys(name):
+                    widget.setStyleSheet(cls.fragment(name))
+            except RuntimeError as _:
+                del _
+
+                continue
+
+            widgets.append((reference, name))
+
+        subscribers = []
+        for keys, reference in cls._subscribers:
+            if (function := reference()) is None:
+                continue
+
+            try:
+                if changed & keys:
+                    function()
+            except RuntimeError as _:
+                del _
+
+                continue
+
+            subscribers.append((keys, reference))
+
+        cls._widgets, cls._subscribers = widgets, subscribers
+
+        return changed
+
+    @classmethod
+    def reload(cls, path: str) -> set[str]:
+        return cls.update(theme.parse(path))
+
+    @classmethod
+    def load(cls, path: str) -> str:
+        cls.reload(path)
+
+        return cls.stylesheet()
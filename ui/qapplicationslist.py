@@ -1,9 +1,10 @@
 from timely.themes import QTheme
 from timely.utils import application
 from timely.utils.smoothscroll import QSmoothScroll
+from timely.utils.textcache import cache
 
 from PySide6.QtCore import Qt, QRect, QPoint
-from PySide6.QtGui import QPaintEvent, QPainter, QPainterPath, QFont, QColor, QWheelEvent, QFontMetrics
+from PySide6.QtGui import QPaintEvent, QPainter, QPainterPath, QFont, QColor, QWheelEvent
 from PySide6.QtWidgets import QFrame, QWidget, QScrollArea
 
 
@@ -19,32 +20,42 @@ class QApplicationListFrame(QFrame):
         self._font.setPointSize(13)
         self._font.setBold(True)
 
-        self._metrics = QFontMetrics(self._font)
-
         self._data = []
 
+        QTheme.style(self)
+        QTheme.subscribe(["applicationListItem", "applicationListSpent", "applicationListLabel"], self.updateColors)
+
+    def updateColors(self) -> None:
+        self.update()
+
     def setData(self, data: list[tuple[str, str]]) -> None:
         self._data = data.copy()
 
-        self.repaint()
+        self.setFixedHeight(len(self._data) * (self._height + self._margin))
+        self.update()
 
     def paintEvent(self, event: QPaintEvent) -> None:
         if not self._data:
             return
 
+        stride = self._height + self._margin
+
+        first = max(event.rect().top() // stride, 0)
+        last = min((event.rect().bottom() // stride) + 1, len(self._data))
+
+        if first >= last:
+            return
+
         painter = QPainter(self)
         painter.setBrush(Qt.BrushStyle.SolidPattern)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         path = QPainterPath()
         spent = QPainterPath()
-        text = QPainterPath()
 
-        y, width = 0, self.width()
-        for title, time in self._data:
-            title = self._metrics.elidedText(
-                title, Qt.TextElideMode.ElideRight, int(width // 1.5) - (self._margin * 4)
-            )
+        width = self.width()
+        for index in range(first, last):
+            y = index * stride
 
             path.addRoundedRect(
                 QRect(self._margin, y, width - (self._margin * 2), self._height), self._corner, self._corner
@@ -58,20 +69,20 @@ class QApplicationListFrame(QFrame):
                 ), self._corner - 1, self._corner - 1
             )
 
-            text.addText(
-                QPoint(self._margin * 2, y + 32), self._font, title
-            )
-            text.addText(
-                QPoint(int(width // 1.5) + self._margin, y + 32), self._font, time
-            )
-
-            y += self._height + self._margin
-
         painter.fillPath(path, QColor(QTheme.get("applicationListItem")))
         painter.fillPath(spent, QColor(QTheme.get("applicationListSpent")))
-        painter.fillPath(text, QColor(QTheme.get("applicationListLabel")))
 
-        self.setFixedSize(width, y)
+        color = QColor(QTheme.get("applicationListLabel"))
+        for index in range(first, last):
+            y, (title, time) = index * stride, self._data[index]
+
+            cache.draw(
+                painter, QPoint(self._margin * 2, y + 32),
+                cache.elided(title, self._font, int(width // 1.5) - (self._margin * 4)), self._font, color
+            )
+            cache.draw(
+                painter, QPoint(int(width // 1.5) + self._margin, y + 32), time, self._font, color
+            )
 
 
 class QApplicationList(QScrollArea):
@@ -1,6 +1,10 @@
+from timely.themes import QTheme
+
 from PySide6.QtWidgets import QPushButton, QWidget
 
 
 class QShareButton(QPushButton):
     def __init__(self, parent: QWidget = None) -> None:
         super().__init__(parent)
+
+        QTheme.style(self)
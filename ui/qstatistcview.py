@@ -1,13 +1,12 @@
 import typing
-from pathlib import Path
 
 from timely.utils import application, pixmap
+from timely.utils.textcache import cache
 from timely.themes import QTheme
 
 from PySide6.QtCharts import QPieSlice, QChart, QChartView, QPieSeries, QLegend
 from PySide6.QtCore import Qt, QRect, QPoint
-from PySide6.QtGui import QResizeEvent, QColor, QBrush, QPainter, QFont, QPaintEvent, QPainterPath, QFontMetrics, \
-    QPixmap
+from PySide6.QtGui import QResizeEvent, QColor, QBrush, QPainter, QFont, QPaintEvent, QPainterPath
 from PySide6.QtWidgets import QWidget, QFrame, QLabel, QSizePolicy
 
 
@@ -25,6 +24,13 @@ class QStatisticLegend(QFrame):
 
         self._data = []
 
+        QTheme.subscribe(["statisticAppBackground"], self.updateColors)
+
+    def updateColors(self) -> None:
+        self._color = QColor(QTheme.get("statisticAppBackground"))
+
+        self.update()
+
     def setData(self, data: list[tuple[str, QColor, float, float]]) -> None:
         self._data = data.copy()
 
@@ -38,13 +44,9 @@ class QStatisticLegend(QFrame):
         painter.setBrush(Qt.BrushStyle.SolidPattern)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        metrics = QFontMetrics(self._font)
-
         y, height = self._margin, (self.height() - ((len(self._data) + 1) * self._margin)) // len(self._data)
         for title, color, spent, percent in self._data:
-            title = metrics.elidedText(
-                title, Qt.TextElideMode.ElideRight, self.width() - (self._margin * 4)
-            )
+            title = cache.elided(title, self._font, self.width() - (self._margin * 4))
 
             time = application.convertSpentTime(spent)
             percentage = f"{percent}%"
@@ -56,24 +58,23 @@ class QStatisticLegend(QFrame):
 
             start = ((self.width() - (self._margin * 2)) // 2)
 
-            title_margin = start - (metrics.boundingRect(title).width() // 2)
-            spent_margin = (start // 2) - (metrics.boundingRect(time).width() // 2)
-            percent_margin = (start // 2) - (metrics.boundingRect(percentage).width() // 2)
+            title_margin = start - (cache.width(title, self._font) // 2)
+            spent_margin = (start // 2) - (cache.width(time, self._font) // 2)
+            percent_margin = (start // 2) - (cache.width(percentage, self._font) // 2)
 
-            labels = QPainterPath()
-            labels.addText(
-                QPoint(self._margin + title_margin, y + (self._margin * 2)), self._font, title
+            painter.fillPath(path, self._color)
+
+            cache.draw(
+                painter, QPoint(self._margin + title_margin, y + (self._margin * 2)), title, self._font, color
             )
-            labels.addText(
-                QPoint(self._margin + spent_margin, int(y + (self._margin * 3.5))), self._font, time
+            cache.draw(
+                painter, QPoint(self._margin + spent_margin, int(y + (self._margin * 3.5))), time, self._font, color
             )
-            labels.addText(
-                QPoint(start + self._margin + percent_margin, int(y + (self._margin * 3.5))), self._font, percentage
+            cache.draw(
+                painter, QPoint(start + self._margin + percent_margin, int(y + (self._margin * 3.5))),
+                percentage, self._font, color
             )
 
-            painter.fillPath(path, self._color)
-            painter.fillPath(labels, color)
-
             y += height + self._margin
 
 
@@ -111,23 +112,21 @@ class QIconedStatistic(QWidget):
         self._calendar_text.resize(68, 30)
         self._calendar_text.move(168, 10)
 
-        QTheme.changed.append(self.iconChanged)
+        QTheme.subscribe(["iconColor", "statisticAppBackground"], self.iconChanged)
 
         self.iconChanged()
 
     def iconChanged(self) -> None:
         self._time_icon.setPixmap(
-            pixmap.colorPixmap(
-                QPixmap(f"{Path.cwd()}/files/icons/time.png"), QColor(QTheme.get("iconColor"))
-            )
+            pixmap.cache.icon("time.png", "iconColor", self._time_icon.size(), self.devicePixelRatioF())
         )
 
         self._calendar_icon.setPixmap(
-            pixmap.colorPixmap(
-                QPixmap(f"{Path.cwd()}/files/icons/calendar.png"), QColor(QTheme.get("iconColor"))
-            )
+            pixmap.cache.icon("calendar.png", "iconColor", self._calendar_icon.size(), self.devicePixelRatioF())
         )
 
+        self.update()
+
     def updateStatistic(self, total: int, time: str) -> None:
         self._time_text.setText(application.convertSpentTime(total))
         self._calendar_text.setText(time.replace("_", "All"))
@@ -172,6 +171,10 @@ class QStatisticView(QWidget):
 
         self._chart.addSeries(self._series)
 
+        self._slices = {}
+        self._colors = {}
+        self._animated = True
+
         self._view = QChartView(self)
         self._view.setChart(self._chart)
         self._view.setRenderHint(QPainter.RenderHint.Antialiasing)
@@ -190,6 +193,33 @@ class QStatisticView(QWidget):
 
         self._legend = QStatisticLegend(self)
 
+        QTheme.subscribe(["statisticAppBackground", "statisticViewBackground"], self.updateColors)
+        QTheme.subscribe([f"pieGraphColor{index}" for index in range(1, 6)], self.updatePieColors)
+
+    def updateColors(self) -> None:
+        self._chart.setBackgroundBrush(
+            QBrush(QColor(QTheme.get("statisticAppBackground")))
+        )
+        self._chart.legend().setBorderColor(
+            QColor(QTheme.get("statisticAppBackground"))
+        )
+        self._view.setBackgroundBrush(
+            QBrush(QColor(QTheme.get("statisticViewBackground")))
+        )
+
+        for slices in self._slices.values():
+            slices.setBorderColor(
+                QColor(QTheme.get("statisticAppBackground"))
+            )
+
+    def updatePieColors(self) -> None:
+        for path, slices in self._slices.items():
+            slices.setColor(
+                QColor(QTheme.get(self._colors[path]))
+            )
+
+        self.updateLegend()
+
     def updateLegend(self) -> None:
         data = []
         for slices in self._series.slices():
@@ -201,21 +231,42 @@ class QStatisticView(QWidget):
             sorted(data, reverse=True, key=lambda value: value[2])
         )
 
+    def nextColor(self) -> str:
+        used = self._colors.values()
+
+        for _ in range(5):
+            if (key := QTheme.pieKey()) not in used:
+                return key
+
+        return QTheme.pieKey()
+
     def setData(self, time: str, data: list[tuple[str, int]]) -> None:
-        self._series.clear()
+        top = dict(sorted(data, reverse=True, key=lambda value: value[1])[:5])
+
+        for path in [path for path in self._slices if path not in top]:
+            self._series.remove(self._slices.pop(path))
+            self._colors.pop(path)
 
-        for path, spent in sorted(data, reverse=True, key=lambda value: value[1])[:5]:
-            name = application.getApplicationTitle(path)
+        for path, spent in top.items():
+            if path in self._slices:
+                self._slices[path].setValue(spent)
 
-            slices = self._series.append(name, spent)
+                continue
+
+            slices = self._series.append(application.getApplicationTitle(path), spent)
             slices.setBorderColor(
                 QColor(QTheme.get("statisticAppBackground"))
             )
+            self._colors[path] = self.nextColor()
+            slices.setColor(
+                QColor(QTheme.get(self._colors[path]))
+            )
 
             slices.hovered.connect(self.sliceHoveredEvent(slices))
-            slices.colorChanged.connect(self.updateLegend)
 
-            slices.setColor(QTheme.pie())
+            self._slices[path] = slices
+
+        self.updateLegend()
 
         self._all_time.setText(
             f"Total time: {application.convertSpentTime(sum([spent for _, spent in data]))}"
@@ -225,8 +276,14 @@ class QStatisticView(QWidget):
             sum([spent for _, spent in data]), time
         )
 
+    def setAnimated(self, animated: bool) -> None:
+        self._animated = animated
+
+        if not animated:
+            self._chart.setAnimationOptions(QChart.AnimationOption.NoAnimation)
+
     def sliceHoveredEvent(self, slices: QPieSlice) -> typing.Callable:
-        if self._chart.animationOptions() == QChart.AnimationOption.NoAnimation:
+        if self._animated and self._chart.animationOptions() == QChart.AnimationOption.NoAnimation:
             self._chart.setAnimationOptions(QChart.AnimationOption.AllAnimations)
 
         slices.setExplodeDistanceFactor(0.05)
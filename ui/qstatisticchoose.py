@@ -1,22 +1,28 @@
 import typing
 
 from timely.utils.smoothscroll import QSmoothScroll
+from timely.utils.textcache import cache
 from timely.themes import QTheme
 
 from PySide6.QtCore import QRect, Qt, Signal, QPoint
 from PySide6.QtGui import (QPaintEvent, QPainter, QColor, QResizeEvent,
-                           QWheelEvent, QMouseEvent, QPainterPath, QFontMetrics, QFont)
+                           QWheelEvent, QMouseEvent, QPainterPath, QFont)
 from PySide6.QtWidgets import QScrollArea, QWidget, QFrame
 
 
 class QChooseData(QFrame):
     clicked = Signal(str)
+    requested = Signal(int)
 
     def __init__(self, parent: QWidget = None) -> None:
         super().__init__(parent)
 
         self._data = []
-        self._rects = []
+        self._indexes = {}
+
+        self._count = 0
+        self._maximum = 0
+        self._pending = False
 
         self._height = 50
         self._margin = 5
@@ -31,101 +37,159 @@ class QChooseData(QFrame):
         self._color = QColor(QTheme.get("chooseRectColor"))
         self._label = QColor(QTheme.get("chooseLabelColor"))
 
+        QTheme.style(self)
+        QTheme.subscribe(["chooseRectColor", "chooseLabelColor"], self.updateColors)
+
+    def updateColors(self) -> None:
+        self._color = QColor(QTheme.get("chooseRectColor"))
+        self._label = QColor(QTheme.get("chooseLabelColor"))
+
+        self.update()
+
     def color(self) -> QColor:
         return self._color
 
     def clear(self) -> None:
-        self._data.clear()
+        self.updateData([])
 
-    def append(self, item: int) -> None:
-        self._data.append(item)
+    def append(self, item: tuple[str, int]) -> None:
+        self.appendData([item])
 
-    def updateData(self, data: list[tuple[str, int]]) -> None:
+    def updateData(self, data: list[tuple[str, int]], count: int = None) -> None:
         self._current = -1
-        self._data = data.copy()
+        self._data, self._indexes = [], {}
+        self._count = count or 0
+        self._maximum = 0
+
+        self.appendData(data)
+
+    def keys(self) -> list[str]:
+        return [key for key, _ in self._data]
+
+    def setPending(self, pending: bool) -> None:
+        self._pending = pending
+
+    def appendData(self, data: list[tuple[str, int]]) -> None:
+        if not data:
+            self._count = len(self._data)
+
+        for key, value in data:
+            self._indexes[key] = len(self._data)
+            self._data.append((key, value))
+
+            self._maximum = max(self._maximum, value)
+
+        self._count = max(self._count, len(self._data))
+        self._pending = False
 
-        self.repaint()
+        self.setFixedSize(
+            ((self._width + self._margin) * self._count) + self._margin, self._height
+        )
+        self.update()
+
+    def addData(self, data: dict[str, int], order: typing.Callable[[str], int] = None) -> list[str]:
+        added = []
+        for key, value in data.items():
+            if key not in self._indexes:
+                index = 0
+                if order is not None:
+                    index = sum(1 for other, _ in self._data if order(other) > order(key))
+
+                self._data.insert(index, (key, value))
+                if self._current >= index:
+                    self._current += 1
+
+                self._indexes = {other: position for position, (other, _) in enumerate(self._data)}
+                added.append(key)
+            else:
+                index = self._indexes[key]
+                self._data[index] = (key, self._data[index][1] + value)
+
+            self._maximum = max(self._maximum, self._data[index][1])
+
+        if added:
+            self._count += len(added)
+
+            self.setFixedSize(
+                ((self._width + self._margin) * self._count) + self._margin, self._height
+            )
+
+        self.update()
+
+        return added
 
     def setColor(self, color: QColor) -> None:
         self._color = color
 
     def setCurrent(self, key: str) -> None:
-        for index, (time, spent) in enumerate(self._data):
-            if time == key:
-                self._current = index
+        self._current = self._indexes.get(key, self._current)
+
+        self.update()
+
+    def barRect(self, index: int) -> QRect:
+        height = int((self._data[index][1] / (self._maximum or 1)) * (self._height - 15))
+        if height < self._corner * 2:
+            height = self._corner * 2
 
-        self.repaint()
+        return QRect(
+            self._margin + (index * (self._width + self._margin)), self._height - height - 15, self._width, height
+        )
 
     def paintEvent(self, event: QPaintEvent) -> None:
         if not self._data:
             return
 
-        self._rects.clear()
+        stride = self._width + self._margin
+
+        first = max((event.rect().left() - self._margin) // stride, 0)
+        last = min(((event.rect().right() - self._margin) // stride) + 1, self._count)
+
+        if last > len(self._data) and not self._pending:
+            self._pending = True
+            self.requested.emit(len(self._data))
+
+        if (last := min(last, len(self._data))) <= first:
+            return
 
         painter = QPainter(self)
         painter.setBrush(Qt.BrushStyle.SolidPattern)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         path = QPainterPath()
-
-        x, maximum = self._margin, max([value for _, value in self._data])
-        for index, (key, value) in enumerate(self._data):
-            height = int((value / maximum) * (self._height - 15))
-            if height < self._corner * 2:
-                height = self._corner * 2
-
-            rect = QRect(
-                x, self._height - height - 15, self._width, height
-            )
-
+        for index in range(first, last):
             if index != self._current:
-                path.addRoundedRect(rect, self._corner, self._corner)
-
-            self._rects.append(
-                (key, value, rect)
-            )
-
-            x += self._width + self._margin
+                path.addRoundedRect(self.barRect(index), self._corner, self._corner)
 
         painter.fillPath(path, self._color)
 
-        if self._current != -1:
-            rect = QRect(self._rects[self._current][2])
-
+        if first <= self._current < last:
             current = QPainterPath()
             current.addRoundedRect(
-                rect, self._corner + 1, self._corner + 1
+                self.barRect(self._current), self._corner + 1, self._corner + 1
             )
 
             painter.fillPath(current, self._color.darker(200))
 
-        labels = QPainterPath()
-        x, metrics = self._margin, QFontMetrics(self._font)
-        for key, _ in self._data:
-            margin = (self._width // 2) - (metrics.boundingRect(key).width() // 2) - 1
+        for index in range(first, last):
+            key = self._data[index][0]
+            margin = (self._width // 2) - (cache.width(key, self._font) // 2) - 1
 
-            labels.addText(
-                QPoint(x + margin, self._height - 2), self._font, key
+            cache.draw(
+                painter, QPoint(self._margin + (index * stride) + margin, self._height - 2), key, self._font,
+                self._label
             )
 
-            x += self._width + self._margin
-
-        painter.fillPath(labels, self._label)
-
-        self.setFixedSize(
-            ((self._width + self._margin) * len(self._data)) + self._margin, self._height
-        )
-
     def mousePressEvent(self, event: QMouseEvent) -> None:
         position = event.position().toPoint()
-        for index, (key, number, rect) in enumerate(self._rects):
-            if rect.contains(position):
-                self._current = index
 
-                self.clicked.emit(key)
-                self.repaint()
+        index = (position.x() - self._margin) // (self._width + self._margin)
+        if index < 0 or index >= len(self._data) or not self.barRect(index).contains(position):
+            return
+
+        self._current = index
 
-                break
+        self.clicked.emit(self._data[index][0])
+        self.update()
 
 
 class QStatisticChooseScroller(QScrollArea):
@@ -158,6 +222,8 @@ class QStatisticChooseBackground(QFrame):
     def __init__(self, parent: QWidget = None) -> None:
         super().__init__(parent)
 
+        QTheme.style(self)
+
 
 class QStatisticChoose(QWidget):
     def __init__(self, parent: QWidget = None) -> None:
@@ -169,8 +235,23 @@ class QStatisticChoose(QWidget):
     def connectData(self, trigger: typing.Callable) -> None:
         self._scroller.chooseData().clicked.connect(trigger)
 
-    def updateData(self, data: list[tuple[str, int]]) -> None:
-        self._scroller.chooseData().updateData(data)
+    def connectRequested(self, trigger: typing.Callable) -> None:
+        self._scroller.chooseData().requested.connect(trigger)
+
+    def updateData(self, data: list[tuple[str, int]], count: int = None) -> None:
+        self._scroller.chooseData().updateData(data, count)
+
+    def appendData(self, data: list[tuple[str, int]]) -> None:
+        self._scroller.chooseData().appendData(data)
+
+    def keys(self) -> list[str]:
+        return self._scroller.chooseData().keys()
+
+    def setPending(self, pending: bool) -> None:
+        self._scroller.chooseData().setPending(pending)
+
+    def addData(self, data: dict[str, int], order: typing.Callable[[str], int] = None) -> list[str]:
+        return self._scroller.chooseData().addData(data, order)
 
     def updateCurrent(self, key: str) -> None:
         self._scroller.chooseData().setCurrent(key)
@@ -1,5 +1,7 @@
 import typing
 
+from timely.themes import QTheme
+
 from PySide6.QtCore import QPropertyAnimation, QPoint, QEasingCurve
 from PySide6.QtGui import QResizeEvent
 from PySide6.QtWidgets import QWidget, QFrame, QPushButton
@@ -9,6 +11,8 @@ class QChooseFrame(QFrame):
     def __init__(self, parent: QWidget = None) -> None:
         super().__init__(parent)
 
+        QTheme.style(self)
+
 
 class QTypeChoose(QFrame):
     def __init__(self, parent: QWidget = None) -> None:
@@ -0,0 +1,140 @@
+import datetime
+
+from peewee import Model, fn, SQL
+
+from timely.models import Application, SpentTimeRollup, SpentTimeTotal, archive
+from timely.models.rollup import FORMATS, bucketExpression
+
+
+def formatBucket(type: str, key: int) -> str:
+    if type == "year":
+        return f"{key}"
+    if type == "month":
+        return f"{key % 100}.{key // 100}"
+    if type == "day":
+        return f"{key % 100}.{(key // 100) % 100}.{key // 10000}"
+
+    return "_"
+
+
+def parseBucket(type: str, time: str) -> int:
+    if type not in FORMATS:
+        return 0
+
+    key = 0
+    for part in reversed(time.split(".")):
+        key = (key * 100) + int(part)
+
+    return key
+
+
+def bucketRange(type: str, time: str) -> tuple[datetime.date, datetime.date] | None:
+    if type not in FORMATS:
+        return None
+
+    parts = [int(part) for part in time.split(".")]
+    if type == "year":
+        return datetime.date(parts[0], 1, 1), datetime.date(parts[0] + 1, 1, 1)
+    if type == "month":
+        month, year = parts
+        return datetime.date(year, month, 1), datetime.date(year + (month // 12), (month % 12) + 1, 1)
+
+    start = datetime.date(parts[2], parts[1], parts[0])
+
+    return start, start + datetime.timedelta(days=1)
+
+
+def countTotals(type: str, model: type[Model]) -> int:
+    return SpentTimeTotal.select().where(SpentTimeTotal.type == type).count()
+
+
+def selectTotals(type: str, model: type[Model], offset: int = 0, limit: int | None = None) -> list[tuple[str, int]]:
+    query = SpentTimeTotal.select(
+        SpentTimeTotal.bucket, SpentTimeTotal.spent
+    ).where(SpentTimeTotal.type == type).order_by(SpentTimeTotal.bucket.desc()).offset(offset).limit(limit).tuples()
+
+    return [(formatBucket(type, key), spent) for key, spent in query]
+
+
+def selectPage(type: str, model: type[Model], offset: int = 0, limit: int = 100) -> tuple[int, list[tuple[str, int]]]:
+    return countTotals(type, model), selectTotals(type, model, offset, limit)
+
+
+def selectApplications(type: str, time: str, model: type[Model]) -> list[tuple[str, int]]:
+    if type != "day":
+        query = SpentTimeRollup.select(
+            Application.path, SpentTimeRollup.spent
+        ).join(Application).where(
+            (SpentTimeRollup.type == type) & (SpentTimeRollup.bucket == parseBucket(type, time))
+        ).order_by(SpentTimeRollup.spent.desc())
+
+        return list(query.tuples())
+
+    start, end = bucketRange(type, time)
+    rows = archive.source(model, start, end)
+
+    spent = fn.SUM(rows.c.spent)
+    query = Application.select(
+        Application.path, spent
+    ).join(rows, on=(rows.c.application_id == Application.id)).group_by(Application.id).order_by(spent.desc())
+
+    return list(query.tuples())
+
+
+def selectRange(type: str, model: type[Model], start: str | None = None,
+                end: str | None = None) -> list[tuple[str, list[tuple[str, int]]]]:
+    if type != "day":
+        bucket = SpentTimeRollup.bucket
+        query = SpentTimeRollup.select(
+            bucket, Application.path, SpentTimeRollup.spent
+        ).join(Application).where(SpentTimeRollup.type == type).order_by(bucket.desc(), SpentTimeRollup.spent.desc())
+
+        if start is not None:
+            query = query.where(bucket >= parseBucket(type, start))
+        if end is not None:
+            query = query.where(bucket <= parseBucket(type, end))
+    else:
+        rows = archive.source(model, start and bucketRange(type, start)[0], end and bucketRange(type, end)[1])
+
+        bucket, spent = bucketExpression(type, rows.c), fn.SUM(rows.c.spent)
+        query = Application.select(
+            bucket, Application.path, spent
+        ).join(rows, on=(rows.c.application_id == Application.id)).group_by(
+            bucket, Application.id
+        ).order_by(bucket.desc(), spent.desc())
+
+    output = {}
+    for key, path, spent in query.tuples():
+        output.setdefault(formatBucket(type, key), []).append((path, spent))
+
+    return list(output.items())
+
+
+def selectTop(type: str, model: type[Model], limit: int | None = 5) -> dict[str, list[tuple[str, int]]]:
+    if type != "day":
+        bucket, spent = SpentTimeRollup.bucket, SpentTimeRollup.spent
+        query = SpentTimeRollup.select().join(Application).where(SpentTimeRollup.type == type)
+    else:
+        rows = archive.source(model)
+
+        bucket, spent = bucketExpression(type, rows.c), fn.SUM(rows.c.spent)
+        query = Application.select().join(rows, on=(rows.c.application_id == Application.id)).group_by(
+            bucket, Application.id
+        )
+
+    query = query.select(bucket.alias("bucket"), Application.path.alias("path"), spent.alias("spent"))
+
+    if limit is not None:
+        ranked = query.select_extend(
+            fn.ROW_NUMBER().over(partition_by=[bucket], order_by=[spent.desc()]).alias("rank")
+        )
+
+        query = model.select(
+            SQL("bucket"), SQL("path"), SQL("spent")
+        ).from_(ranked.alias("ranked")).where(SQL("rank") <= limit)
+
+    output = {}
+    for key, application, seconds in query.order_by(SQL("bucket").desc(), SQL("spent").desc()).tuples():
+        output.setdefault(formatBucket(type, key), []).append((application, seconds))
+
+    return output
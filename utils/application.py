@@ -1,26 +1,9 @@
-import os
+try:
+    import win32api
+except ImportError:
+    win32api = None
 
-import win32api
-import win32gui
-import win32process
-
-
-def getApplicationPath(hwnd: int) -> str:
-    _, pid = win32process.GetWindowThreadProcessId(hwnd)
-    process = win32api.OpenProcess(0x0400, False, pid)
-
-    try:
-        location = win32process.GetModuleFileNameEx(process, 0)
-    finally:
-        win32api.CloseHandle(process)
-
-    return location or ""
-
-
-def getCurrentApplication() -> tuple[str, str]:
-    hwnd = win32gui.GetForegroundWindow()
-
-    return win32gui.GetWindowText(hwnd), getApplicationPath(hwnd)
+from timely.utils import metadata
 
 
 def getFileProperties(path: str) -> dict[str, dict | object]:
@@ -60,11 +43,7 @@ def getFileProperties(path: str) -> dict[str, dict | object]:
 
 
 def getApplicationTitle(path: str) -> str:
-    properties, name = getFileProperties(path), os.path.basename(path).replace(".exe", "").capitalize()
-    if properties["StringFileInfo"]:
-        name = properties["StringFileInfo"]["FileDescription"] or name
-
-    return name
+    return metadata.cache.title(path)
 
 
 def convertSpentTime(spent: int) -> str:
@@ -0,0 +1,68 @@
+import datetime
+import threading
+
+from timely import models
+
+
+class SpentTimeBuffer(object):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._data = {}
+        self._sessions = []
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def append(self, path: str, day: datetime.date, spent: float = 1) -> None:
+        with self._lock:
+            self._data[(path, day)] = self._data.get((path, day), 0) + spent
+
+    def appendInterval(self, path: str, start: float, end: float) -> None:
+        while start < end:
+            day = datetime.date.fromtimestamp(start)
+            midnight = datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time()).timestamp()
+
+            self.append(path, day, min(end, midnight) - start)
+
+            start = midnight
+
+    def appendSession(self, path: str, title: str, start: float, end: float) -> None:
+        if start >= end:
+            return
+
+        with self._lock:
+            self._sessions.append((path, title, start, end))
+
+    def discardSessions(self) -> None:
+        with self._lock:
+            self._sessions = []
+
+    def flush(self) -> list[tuple[str, datetime.date, int]]:
+        with self._lock:
+            data, self._data = self._data, {}
+            sessions, self._sessions = self._sessions, []
+
+            rows, latest = [], max([day for _, day in data], default=None)
+            for (path, day), spent in data.items():
+                whole = int(spent) if day == latest else round(spent)
+                if day == latest and spent - whole:
+                    self._data[(path, day)] = spent - whole
+
+                if whole:
+                    rows.append((path, day, whole))
+
+        if not rows and not sessions:
+            return rows
+
+        try:
+            models.record(rows, sessions)
+        except Exception:
+            with self._lock:
+                for path, day, spent in rows:
+                    self._data[(path, day)] = self._data.get((path, day), 0) + spent
+
+                self._sessions[:0] = sessions
+
+            raise
+
+        return rows
@@ -0,0 +1,224 @@
+import os
+import typing
+
+from timely.themes import QTheme
+from timely.utils.worker import QStorageWorker
+
+from PySide6.QtCore import QObject, QPoint, QRectF, QSize, QBuffer, QByteArray, QIODevice, QMimeData, QTimer, Qt
+from PySide6.QtGui import QImage, QPicture, QPainter, QColor, QClipboard
+from PySide6.QtSvg import QSvgGenerator
+from PySide6.QtWidgets import QWidget, QGraphicsView, QApplication
+
+FORMATS = {
+    "png": "PNG",
+    "jpg": "JPEG",
+    "jpeg": "JPEG",
+    "svg": "SVG"
+}
+
+
+def record(widget: QWidget) -> QPicture:
+    picture = QPicture()
+
+    painter = QPainter(picture)
+    widget.render(painter, QPoint())
+
+    for view in widget.findChildren(QGraphicsView):
+        if not view.isVisibleTo(widget):
+            continue
+
+        painter.save()
+        painter.translate(view.mapTo(widget, QPoint()))
+
+        view.render(painter, QRectF(view.rect()), view.rect())
+
+        painter.restore()
+
+    painter.end()
+
+    return picture
+
+
+class QExporter(QObject):
+    _worker = None
+
+    def __init__(self, buffers: int = 4) -> None:
+        super().__init__()
+
+        if QExporter._worker is None:
+            QExporter._worker = QStorageWorker()
+
+        self._size = buffers
+        self._buffers = {}
+
+        self._batch = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.exportNext)  # noqa
+
+    def buffer(self, size: QSize, format: QImage.Format) -> QImage:
+        if (key := (size.width(), size.height(), format)) not in self._buffers:
+            if len(self._buffers) >= self._size:
+                self._buffers.clear()
+
+            self._buffers[key] = QImage(size, format)
+
+        return self._buffers[key]
+
+    def render(self, picture: QPicture, format: str, scale: float, background: QColor) -> QImage | QByteArray:
+        rect = picture.boundingRect()
+
+        if format == "SVG":
+            data = QByteArray()
+
+            buffer = QBuffer(data)
+            buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+
+            generator = QSvgGenerator()
+            generator.setOutputDevice(buffer)
+            generator.setSize(rect.size())
+            generator.setViewBox(rect)
+
+            painter = QPainter(generator)
+            picture.play(painter)
+            painter.end()
+
+            return data
+
+        image = self.buffer(
+            rect.size() * scale,
+            QImage.Format.Format_RGB32 if format == "JPEG" else QImage.Format.Format_ARGB32_Premultiplied
+        )
+        image.setDevicePixelRatio(scale)
+        image.fill(background if format == "JPEG" else Qt.GlobalColor.transparent)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.translate(-rect.topLeft())
+
+        picture.play(painter)
+        painter.end()
+
+        return image
+
+    @staticmethod
+    def save(result: QImage | QByteArray, path: str, format: str) -> str:
+        if isinstance(result, QByteArray):
+            with open(path, mode="wb") as file:
+                file.write(result.data())
+        elif not result.save(path, format, 95):
+            raise OSError(f"Can't write {path}")
+
+        return path
+
+    @staticmethod
+    def copy(result: QImage | QByteArray) -> None:
+        if isinstance(result, QByteArray):
+            data = QMimeData()
+            data.setData("image/svg+xml", result)
+
+            QApplication.clipboard().setMimeData(data, QClipboard.Mode.Clipboard)
+        else:
+            QApplication.clipboard().setImage(result, QClipboard.Mode.Clipboard)
+
+    @staticmethod
+    def format(path: str | None, format: str | None) -> str:
+        return FORMATS[(format or (os.path.splitext(path)[1][1:] if path else "") or "png").lower()]
+
+    def submit(self, picture: QPicture, path: str | None, format: str, scale: float,
+               callback: typing.Callable = None, errback: typing.Callable = None) -> int:
+        background = QColor(QTheme.get("background"))
+
+        def job() -> QImage | QByteArray | str:
+            result = self.render(picture, format, scale, background)
+            if path is None:
+                return result
+
+            return self.save(result, path, format)
+
+        def handle(result: QImage | QByteArray | str) -> None:
+            if path is None:
+                self.copy(result)
+
+            if callable(callback):
+                callback(path)
+
+        return self._worker.submit(job, callback=handle, errback=errback)
+
+    def export(self, widget: QWidget, path: str = None, format: str = None, scale: float = 5,
+               callback: typing.Callable = None, errback: typing.Callable = None) -> int:
+        return self.submit(record(widget), path, self.format(path, format), scale, callback, errback)
+
+    def isExporting(self) -> bool:
+        return self._batch is not None
+
+    def exportBatch(self, view: QWidget, data: list[tuple[str, list[tuple[str, int]]]], directory: str,
+                    prefix: str, format: str = "png", scale: float = 5, callback: typing.Callable = None,
+                    errback: typing.Callable = None) -> bool:
+        if self.isExporting():
+            return False
+
+        self._batch = {
+            "view": view, "data": iter(data), "directory": directory, "prefix": prefix,
+            "format": self.format(None, format), "scale": scale, "callback": callback, "errback": errback,
+            "current": None, "paths": [], "submitted": 0, "done": 0, "finished": False
+        }
+
+        self._timer.start()
+
+        return True
+
+    def cancelBatch(self) -> None:
+        self._timer.stop()
+
+        self._batch = None
+
+    def exportNext(self) -> None:
+        batch = self._batch
+
+        def finish() -> None:
+            if batch["finished"] and batch["done"] == batch["submitted"] and callable(batch["callback"]):
+                batch["callback"](batch["paths"])
+
+        def handle(path: str) -> None:
+            batch["paths"].append(path)
+            batch["done"] += 1
+
+            finish()
+
+        def fail(error: Exception) -> None:
+            batch["done"] += 1
+
+            if callable(batch["errback"]):
+                batch["errback"](error)
+
+            finish()
+
+        try:
+            if batch["current"] is not None:
+                self.submit(
+                    record(batch["view"]), os.path.join(
+                        batch["directory"],
+                        f"{batch['prefix']}-{batch['current']}.{batch['format'].lower().replace('jpeg', 'jpg')}"
+                    ), batch["format"], batch["scale"], handle, fail
+                )
+
+                batch["submitted"] += 1
+
+            if (item := next(batch["data"], None)) is None:
+                batch["finished"] = True
+                self.cancelBatch()
+
+                finish()
+
+                return
+
+            batch["current"] = item[0]
+            batch["view"].setData(*item)
+        except RuntimeError as _:
+            del _
+
+            self.cancelBatch()
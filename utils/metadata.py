@@ -0,0 +1,141 @@
+import collections
+import os
+import queue
+import sys
+import threading
+
+from timely.models import ApplicationMetadata, applications
+from timely.models import storage
+from timely.utils.worker import QStorageWorker
+
+
+class ApplicationProvider(object):
+    def title(self, path: str) -> str:
+        raise NotImplementedError
+
+
+class BasenameProvider(ApplicationProvider):
+    def title(self, path: str) -> str:
+        return os.path.basename(path).replace(".exe", "").capitalize()
+
+
+class WindowsProvider(BasenameProvider):
+    def title(self, path: str) -> str:
+        from timely.utils.application import getFileProperties
+
+        properties, name = getFileProperties(path), super().title(path)
+        if properties["StringFileInfo"]:
+            name = properties["StringFileInfo"]["FileDescription"] or name
+
+        return name
+
+
+class ApplicationMetadataCache(object):
+    def __init__(self, provider: ApplicationProvider, size: int = 4096) -> None:
+        self._provider = provider
+        self._size = size
+
+        self._lock = threading.Lock()
+        self._data = collections.OrderedDict()
+
+        self._queue = queue.Queue()
+        self._thread = None
+
+    @staticmethod
+    def _stat(path: str) -> tuple[float, int]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return 0.0, 0
+
+        return stat.st_mtime, stat.st_size
+
+    def _remember(self, path: str, title: str) -> None:
+        with self._lock:
+            self._data[path] = title
+            self._data.move_to_end(path)
+
+            while len(self._data) > self._size:
+                self._data.popitem(last=False)
+
+    def _resolve(self, path: str) -> str:
+        mtime, size = self._stat(path)
+        title = self._provider.title(path)
+
+        self._remember(path, title)
+
+        if (worker := QStorageWorker.instance()).isWorkerThread():
+            self._persist(path, mtime, size, title)
+        else:
+            worker.submit(self._persist, path, mtime, size, title)
+
+        return title
+
+    @staticmethod
+    def _persist(path: str, mtime: float, size: int, title: str) -> None:
+        try:
+            with storage.lock:
+                ApplicationMetadata.insert(
+                    path=path, mtime=mtime, size=size, title=title
+                ).on_conflict(
+                    conflict_target=[ApplicationMetadata.path],
+                    update={ApplicationMetadata.mtime: mtime, ApplicationMetadata.size: size,
+                            ApplicationMetadata.title: title}
+                ).execute()
+
+                applications.setTitle(path, title)
+        except Exception as _:
+            del _
+
+    def _refresh(self) -> None:
+        while True:
+            path, mtime, size = self._queue.get()
+
+            try:
+                if self._stat(path) != (mtime, size):
+                    self._resolve(path)
+            except Exception as _:
+                del _
+
+    def _schedule(self, path: str, mtime: float, size: int) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._refresh, daemon=True)
+            self._thread.start()
+
+        self._queue.put((path, mtime, size))
+
+    def setProvider(self, provider: ApplicationProvider) -> None:
+        self._provider = provider
+
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def title(self, path: str) -> str:
+        with self._lock:
+            if path in self._data:
+                self._data.move_to_end(path)
+
+                return self._data[path]
+
+        try:
+            metadata = ApplicationMetadata.get_or_none(ApplicationMetadata.path == path)
+        except Exception as _:
+            del _
+
+            metadata = None
+
+        if metadata is None:
+            return self._resolve(path)
+
+        self._remember(path, metadata.title)
+        self._schedule(path, metadata.mtime, metadata.size)
+
+        return metadata.title
+
+
+cache = ApplicationMetadataCache(
+    WindowsProvider() if sys.platform == "win32" else BasenameProvider()
+)
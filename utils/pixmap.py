@@ -1,8 +1,14 @@
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap, QColor, QPainter
+import os
+
+from timely.themes import QTheme
+
+from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QPixmap, QColor, QPainter, QImage
 
 
 def colorPixmap(pixmap: QPixmap, color: QColor) -> QPixmap:
+    pixmap = QPixmap(pixmap)
+
     painter = QPainter(pixmap)
     painter.setCompositionMode(
         QPainter.CompositionMode.CompositionMode_SourceIn
@@ -11,6 +17,69 @@ def colorPixmap(pixmap: QPixmap, color: QColor) -> QPixmap:
     painter.fillRect(pixmap.rect(), color)
     painter.end()
 
-    return QPixmap(pixmap).scaled(
-        pixmap.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
-    )
+    return pixmap
+
+
+class QIconCache(object):
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+        self._sources = {}
+        self._colors = {}
+        self._data = {}
+
+    def source(self, name: str) -> QPixmap:
+        if name not in self._sources:
+            self._sources[name] = QPixmap(f"{self._path}/{name}")
+
+        return self._sources[name]
+
+    def icon(self, name: str, key: str, size: QSize = None, ratio: float = 1.0) -> QPixmap:
+        source = self.source(name)
+        if size is None:
+            size = source.size() / ratio
+
+        color = self._colors[key] = QTheme.get(key)
+        if (cached := (name, color, size.width(), size.height(), ratio)) in self._data:
+            return self._data[cached]
+
+        image = source.toImage().scaled(
+            size * ratio, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+        ).convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+
+        painter = QPainter(image)
+        painter.setCompositionMode(
+            QPainter.CompositionMode.CompositionMode_SourceIn
+        )
+
+        painter.fillRect(image.rect(), QColor(color))
+        painter.end()
+
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(ratio)
+
+        self._data[cached] = pixmap
+
+        return pixmap
+
+    def warm(self, icons: list[tuple[str, str, QSize | None]], ratio: float = 1.0) -> None:
+        for name, key, size in icons:
+            self.icon(name, key, size, ratio)
+
+    def invalidate(self) -> None:
+        self._colors = {key: QTheme.get(key) for key in self._colors}
+
+        colors = set(self._colors.values())
+        for cached in [cached for cached in self._data if cached[1] not in colors]:
+            del self._data[cached]
+
+    def clear(self) -> None:
+        self._sources.clear()
+        self._data.clear()
+
+
+cache = QIconCache(
+    f"{os.path.dirname(os.path.dirname(os.path.realpath(__file__)))}/files/icons"
+)
+
+QTheme.changed.append(cache.invalidate)
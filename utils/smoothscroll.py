@@ -1,9 +1,33 @@
 import collections
+import functools
 import math
 
-from PySide6.QtCore import Qt, QDateTime, QPoint, QTimer
+from PySide6.QtCore import Qt, QDateTime, QTimer
 from PySide6.QtGui import QWheelEvent
-from PySide6.QtWidgets import QAbstractScrollArea, QApplication
+from PySide6.QtWidgets import QAbstractScrollArea, QApplication, QScrollBar
+
+
+@functools.cache
+def easing(mode: int, steps: int) -> tuple[float, ...]:
+    maximum = steps / 2
+
+    output = []
+    for step in range(steps):
+        absolute = abs(step - maximum)
+
+        resource = 0
+        if mode == 1:
+            resource = (2 * maximum / steps) * 10
+        if mode == 2:
+            resource = (2 * maximum / steps * (maximum - absolute) / maximum) * 10
+        if mode == 3:
+            resource = 3 / 4 / maximum * (1 - absolute * absolute / maximum / maximum)
+        if mode == 4:
+            resource = (math.cos(absolute * math.pi / maximum) + 1) / (2 * maximum)
+
+        output.append(resource)
+
+    return tuple(output)
 
 
 class QSmoothScroll:
@@ -23,16 +47,16 @@ class QSmoothScroll:
         self._fps = 60
         self._duration = 250
 
-        self._steps = 0
+        self._steps = int(self._fps * self._duration / 1000)
         self._ratio = 1.5
         self._acceleration = 1
 
-        self._last_event = None
-        self._last_pos = None
-        self._last_global_pos = None
+        self._curve = [0.0] * self._steps
+        self._head = 0
+        self._left = 0
+        self._offset = 0.0
 
         self._scroll_stamps = collections.deque()
-        self._steps_left_queue = collections.deque()
 
         self._timer = QTimer(self._target)
         self._timer.timeout.connect(self.smoothMode)
@@ -40,59 +64,28 @@ class QSmoothScroll:
     def setSmoothMode(self, mode: int) -> None:
         self._smooth_mode = mode
 
-    def smoothMode(self) -> None:
-        delta = 0
-
-        for chunk in self._steps_left_queue:
-            delta += self.subDelta(chunk[0], chunk[1])
-
-            chunk[1] -= 1
+    def scrollBar(self) -> QScrollBar:
+        if self._orient == Qt.Orientation.Vertical:
+            return self._target.verticalScrollBar()
 
-        while self._steps_left_queue and not self._steps_left_queue[0][1]:
-            self._steps_left_queue.popleft()
+        return self._target.horizontalScrollBar()
 
-        if self._orient == Qt.Orientation.Vertical:
-            pixel = QPoint(round(delta), 0)
-            bar = self._target.verticalScrollBar()
-        else:
-            pixel = QPoint(0, round(delta))
-            bar = self._target.horizontalScrollBar()
-
-        event = QWheelEvent(
-            self._last_pos,
-            self._last_global_pos,
-            pixel,
-            QPoint(round(delta), 0),
-            Qt.MouseButton.LeftButton,
-            Qt.KeyboardModifier.NoModifier,
-            Qt.ScrollPhase.ScrollBegin,
-            False
-        )
+    def smoothMode(self) -> None:
+        delta, self._curve[self._head] = self._curve[self._head], 0.0
 
-        QApplication.sendEvent(bar, event)
+        self._head = (self._head + 1) % self._steps
+        self._left -= 1
 
-        if not self._steps_left_queue:
-            self._timer.stop()
+        bar = self.scrollBar()
 
-    def subDelta(self, delta: int, left: int) -> int:
-        maximum = self._steps / 2
-        absolute = abs(self._steps - left - maximum)
+        self._offset += round(delta) / 120 * QApplication.wheelScrollLines() * bar.singleStep()
+        if steps := int(self._offset):
+            self._offset -= steps
 
-        # print(delta, left)
+            bar.setValue(bar.value() - steps)
 
-        resource = 0
-        if self._smooth_mode == 0:
-            resource = 0
-        if self._smooth_mode == 1:
-            resource = (delta / abs(delta)) * (2 * maximum / self._steps) * 10
-        if self._smooth_mode == 2:
-            resource = (delta / abs(delta)) * (2 * maximum / self._steps * (maximum - absolute) / maximum) * 10
-        if self._smooth_mode == 3:
-            resource = 3 / 4 / maximum * (1 - absolute * absolute / maximum / maximum) * delta
-        if self._smooth_mode == 4:
-            resource = (math.cos(absolute * math.pi / maximum) + 1) / (2 * maximum) * delta
-
-        return resource
+        if self._left <= 0:
+            self._timer.stop()
 
     def wheelEvent(self, event: QWheelEvent) -> None:
         delta = event.angleDelta().y() if event.angleDelta().y() else event.angleDelta().x()
@@ -107,14 +100,16 @@ class QSmoothScroll:
 
         acceleration = min(len(self._scroll_stamps) / 15, 1)
 
-        self._last_pos = event.position()
-        self._last_global_pos = event.globalPosition()
-
-        self._steps = self._fps * self._duration / 1000
-
         delta *= self._ratio
         if self._acceleration > 0:
             delta += delta * self._acceleration * acceleration
 
-        self._steps_left_queue.append([delta, self._steps])
-        self._timer.start(int(1000 / self._fps))
+        if self._smooth_mode in (self.Type.Constant, self.Type.Linear):
+            delta = delta / abs(delta)
+
+        for step, resource in enumerate(easing(self._smooth_mode, self._steps)):
+            self._curve[(self._head + step) % self._steps] += resource * delta
+
+        self._left = self._steps
+        if not self._timer.isActive():
+            self._timer.start(int(1000 / self._fps))
@@ -1,16 +1,101 @@
 import asyncio
+import threading
+import time
+
 import winsdk.windows.media.control as wmc
 
 
-async def getMediaSession() -> wmc.GlobalSystemMediaTransportControlsSession:
-    sessions = await wmc.GlobalSystemMediaTransportControlsSessionManager.request_async()
+class MediaWatcher(object):
+    def __init__(self, retry: float = 30) -> None:
+        self._lock = threading.Lock()
+        self._playing = False
+
+        self._retry = retry
+        self._retry_at = 0.0
+
+        self._loop = None
+        self._thread = None
+
+        self._manager = None
+        self._session = None
+        self._token = None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None or time.monotonic() < self._retry_at:
+                return
+
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run, args=(self._loop,), daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                return
+
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread = None
+
+    def isPlaying(self) -> bool:
+        with self._lock:
+            return self._playing
+
+    def _run(self, loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+
+        try:
+            loop.run_until_complete(self._connect())
+            loop.run_forever()
+        except Exception as _:
+            del _
+        finally:
+            self._watch(None)
+            loop.close()
+
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+                    self._retry_at = time.monotonic() + self._retry
+
+    async def _connect(self) -> None:
+        self._manager = await wmc.GlobalSystemMediaTransportControlsSessionManager.request_async()
+        self._manager.add_current_session_changed(self._sessionChanged)
+
+        self._watch(self._manager.get_current_session())
+
+    def _sessionChanged(self, manager: wmc.GlobalSystemMediaTransportControlsSessionManager, _: object) -> None:
+        self._loop.call_soon_threadsafe(self._watch, manager.get_current_session())
+
+    def _playbackChanged(self, *_: object) -> None:
+        self._loop.call_soon_threadsafe(self._update)
+
+    def _watch(self, session: wmc.GlobalSystemMediaTransportControlsSession | None) -> None:
+        if self._session is not None and self._token is not None:
+            self._session.remove_playback_info_changed(self._token)
+
+        self._session, self._token = session, None
+        if session is not None:
+            self._token = session.add_playback_info_changed(self._playbackChanged)
+
+        self._update()
+
+    def _update(self) -> None:
+        try:
+            playing = self._session is not None and self._session.get_playback_info().playback_status == 4
+        except Exception as _:
+            del _
+
+            playing = False
+
+        with self._lock:
+            self._playing = playing
+
 
-    return sessions.get_current_session()
+watcher = MediaWatcher()
 
 
 def mediaIsPlaying() -> bool:
-    session = asyncio.run(getMediaSession())
-    if session is None:
-        return False
+    watcher.start()
 
-    return session.get_playback_info().playback_status == 4
+    return watcher.isPlaying()
@@ -0,0 +1,100 @@
+import collections
+
+from timely.themes import QTheme
+
+from PySide6.QtCore import Qt, QPoint
+from PySide6.QtGui import QPainter, QPixmap, QFont, QFontMetrics, QColor, QPaintEngine
+
+
+class QTextCache(object):
+    def __init__(self, size: int = 4096) -> None:
+        self._size = size
+
+        self._metrics = {}
+        self._elided = collections.OrderedDict()
+        self._widths = collections.OrderedDict()
+        self._pixmaps = collections.OrderedDict()
+
+    def _remember(self, cache: collections.OrderedDict, key: tuple, value: object) -> object:
+        cache[key] = value
+
+        while len(cache) > self._size:
+            cache.popitem(last=False)
+
+        return value
+
+    def metrics(self, font: QFont) -> QFontMetrics:
+        if (key := font.key()) not in self._metrics:
+            self._metrics[key] = QFontMetrics(font)
+
+        return self._metrics[key]
+
+    def elided(self, text: str, font: QFont, width: int) -> str:
+        if (key := (text, font.key(), width)) in self._elided:
+            self._elided.move_to_end(key)
+
+            return self._elided[key]
+
+        return self._remember(
+            self._elided, key, self.metrics(font).elidedText(text, Qt.TextElideMode.ElideRight, width)
+        )
+
+    def width(self, text: str, font: QFont) -> int:
+        if (key := (text, font.key())) in self._widths:
+            self._widths.move_to_end(key)
+
+            return self._widths[key]
+
+        return self._remember(
+            self._widths, key, self.metrics(font).boundingRect(text).width()
+        )
+
+    def pixmap(self, text: str, font: QFont, color: QColor, ratio: float = 1.0) -> QPixmap:
+        if (key := (text, font.key(), color.rgba(), ratio)) in self._pixmaps:
+            self._pixmaps.move_to_end(key)
+
+            return self._pixmaps[key]
+
+        metrics = self.metrics(font)
+
+        pixmap = QPixmap(
+            int((metrics.horizontalAdvance(text) + 2) * ratio), int(metrics.height() * ratio)
+        )
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setFont(font)
+        painter.setPen(color)
+        painter.drawText(QPoint(0, metrics.ascent()), text)
+        painter.end()
+
+        return self._remember(self._pixmaps, key, pixmap)
+
+    def draw(self, painter: QPainter, point: QPoint, text: str, font: QFont, color: QColor) -> None:
+        if painter.paintEngine().type() in (QPaintEngine.Type.Picture, QPaintEngine.Type.SVG):
+            painter.save()
+            painter.setFont(font)
+            painter.setPen(color)
+            painter.drawText(point, text)
+            painter.restore()
+
+            return
+
+        painter.drawPixmap(
+            QPoint(point.x(), point.y() - self.metrics(font).ascent()),
+            self.pixmap(text, font, color, painter.device().devicePixelRatioF())
+        )
+
+    def clear(self) -> None:
+        self._metrics.clear()
+        self._elided.clear()
+        self._widths.clear()
+        self._pixmaps.clear()
+
+
+cache = QTextCache()
+
+QTheme.changed.append(cache.clear)
@@ -1,13 +1,9 @@
-def parse(path: str) -> dict[str, str]:
-    with open(path, mode="r", encoding="utf-8") as file:
-        data = file.readlines()
+from timely.utils import tokenizer
+
 
-    output = {}
-    for line in data:
-        line = line.strip()
-        if line.startswith("//") or not line:
-            continue
+def _parse(text: str, path: str = None) -> dict[str, str]:
+    return {key: value for _, key, value in tokenizer.tokenize(text, comment="//", quoted=False, path=path)}
 
-        output[line.split("=", 1)[0]] = line.split("=", 1)[1]
 
-    return output
+def parse(path: str) -> dict[str, str]:
+    return tokenizer.load(path, lambda text: _parse(text, path))
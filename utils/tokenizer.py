@@ -0,0 +1,111 @@
+import functools
+import marshal
+import os
+import re
+import typing
+
+VERSION = 1
+
+STRING = re.compile(r"\"((?:\\.|[^\"\\\n])*)\"")
+
+
+@functools.cache
+def _pattern(comment: str) -> re.Pattern:
+    return re.compile(
+        rf"^[ \t]*(?:(?P<comment>{re.escape(comment)}.*)|(?P<key>[^\"=\n]*=)(?P<value>.*)|(?P<text>.*))$", re.MULTILINE
+    )
+
+
+def _error(message: str, path: str, text: str, line: int, column: int) -> SyntaxError:
+    source = text.splitlines()[line - 1]
+
+    return SyntaxError(f"{message} (line {line}, column {column})", (path, line, column, source))
+
+
+def tokenize(text: str, *, comment: str, quoted: bool, path: str = None,
+             ignore_errors: bool = False) -> typing.Iterator[tuple[int, str | None, str]]:
+    if not quoted:
+        for line, source in enumerate(text.split("\n"), 1):
+            if not (source := source.strip()) or source.startswith(comment):
+                continue
+
+            key, assign, value = source.partition("=")
+            if not assign:
+                if not ignore_errors:
+                    raise _error("Assignment operator not found", path, text, line, 1)
+
+                continue
+
+            yield line, key.rstrip(), value.lstrip()
+
+        return
+
+    assigned = False
+
+    for line, (commented, key, value, rest) in enumerate(_pattern(comment).findall(text), 1):
+        if commented:
+            continue
+
+        if not key:
+            if not rest.strip():
+                continue
+
+            key, value = None, rest
+
+            if not assigned:
+                if not ignore_errors:
+                    raise _error("Assignment operator not found", path, text, line, 1)
+
+                continue
+
+        if key is not None:
+            key = key[:-1].strip()
+
+        if not ignore_errors:
+            if (stray := STRING.sub(lambda string: " " * len(string.group()), value).find("\"")) != -1:
+                source = text.splitlines()[line - 1]
+
+                raise _error("Unterminated string", path, text, line, len(source) - len(value) + stray + 1)
+
+        if key is not None and not re.fullmatch(r"[\w.]*", key):
+            if not ignore_errors:
+                raise _error(f"Invalid key {key!r}", path, text, line, 1)
+
+            continue
+
+        yield line, key, "".join(STRING.findall(value))
+
+        assigned = assigned or key is not None
+
+
+def _cache(path: str) -> str:
+    return os.path.join(os.path.dirname(path), "__pycache__", f"{os.path.basename(path)}.cache")
+
+
+def load(path: str, parser: typing.Callable[[str], dict[str, str]], *options: object) -> dict[str, str]:
+    stat = os.stat(path)
+    header = (VERSION, stat.st_mtime_ns, stat.st_size, options)
+
+    try:
+        with open(_cache(path), mode="rb") as file:
+            cached, data = marshal.loads(file.read())
+
+        if cached == header:
+            return data
+    except (OSError, EOFError, ValueError, TypeError) as _:
+        del _
+
+    with open(path, mode="r", encoding="utf-8") as file:
+        data = parser(file.read())
+
+    try:
+        os.makedirs(os.path.dirname(_cache(path)), exist_ok=True)
+
+        with open(f"{_cache(path)}.tmp", mode="wb") as file:
+            marshal.dump((header, data), file)
+
+        os.replace(f"{_cache(path)}.tmp", _cache(path))
+    except OSError as _:
+        del _
+
+    return data
@@ -0,0 +1,151 @@
+import datetime
+import threading
+
+from timely.models import sessions
+from timely.samplers import Sampler
+from timely.utils.buffer import SpentTimeBuffer
+
+
+class Tracker(object):
+    def __init__(self, sampler: Sampler, buffer: SpentTimeBuffer = None, idle: float = 300,
+                 sessions: bool = False) -> None:
+        self._sampler = sampler
+        self._buffer = buffer if buffer is not None else SpentTimeBuffer()
+        self._idle = idle
+        self._sessions = sessions
+        self._prepared = False
+
+        self._lock = threading.RLock()
+        self._today = self.today()
+        self._current = None
+        self._session = None
+        self._compacted = self._sampler.now()
+
+    def sampler(self) -> Sampler:
+        return self._sampler
+
+    def buffer(self) -> SpentTimeBuffer:
+        return self._buffer
+
+    def setSessions(self, enabled: bool) -> None:
+        with self._lock:
+            self._sessions = enabled
+
+            if not enabled:
+                self._session = None
+                self._buffer.discardSessions()
+
+    def today(self) -> datetime.date:
+        return datetime.date.fromtimestamp(self._sampler.now())
+
+    def idle(self) -> float | None:
+        idle = self._sampler.getIdleDuration()
+        if idle > self._idle and not self._sampler.mediaIsPlaying():
+            return idle
+
+        return None
+
+    def _extend(self, title: str, path: str, start: float, end: float) -> None:
+        if self._session is not None and self._session[:2] == [path, title] and start - self._session[3] <= 1:
+            self._session[3] = end
+
+            return
+
+        self._closeSession()
+        self._session = [path, title, start, end]
+
+    def _closeSession(self) -> None:
+        if self._session is not None:
+            self._buffer.appendSession(*self._session)
+
+        self._session = None
+
+    def rolled(self) -> bool:
+        if (today := self.today()) != self._today:
+            self._today = today
+
+            return True
+
+        return False
+
+    def tick(self, spent: int = 1) -> bool:
+        with self._lock:
+            rolled, today = self.rolled(), self._today
+
+            if self.idle() is not None:
+                self._closeSession()
+
+                return rolled
+
+            title, path = self._sampler.getCurrentApplication()
+
+            self._buffer.append(path, today, spent)
+
+            if self._sessions:
+                now = self._sampler.now()
+
+                self._extend(title, path, now, now + spent)
+
+            return rolled
+
+    def _close(self, end: float) -> None:
+        if self._current is not None:
+            path, title, start = self._current
+
+            self._buffer.appendInterval(path, start, max(start, end))
+
+            if self._sessions:
+                self._buffer.appendSession(path, title, start, end)
+
+        self._current = None
+
+    def focus(self) -> None:
+        with self._lock:
+            now = self._sampler.now()
+
+            self._close(now)
+
+            if self.idle() is None:
+                title, path = self._sampler.getCurrentApplication()
+
+                self._current = path, title, now
+
+    def heartbeat(self) -> bool:
+        with self._lock:
+            now = self._sampler.now()
+
+            if (idle := self.idle()) is not None:
+                self._close(now - idle)
+            elif self._current is None or self._current[0] != self._sampler.getCurrentApplication()[1]:
+                self.focus()
+
+            return self.rolled()
+
+    def flush(self) -> list[tuple[str, datetime.date, int]]:
+        with self._lock:
+            if self._current is not None:
+                path, title, now = *self._current[:2], self._sampler.now()
+
+                self._close(now)
+                self._current = path, title, now
+
+            if self._session is not None:
+                session = self._session.copy()
+
+                self._closeSession()
+                self._session = [session[0], session[1], session[3], session[3]]
+
+        if self._sessions and not self._prepared:
+            self._prepared = True
+
+            if not sessions.create():
+                self.setSessions(False)
+
+        rows = self._buffer.flush()
+
+        if self._sessions:
+            sessions.compact(self._compacted - 3600)
+
+            self._compacted = self._sampler.now()
+
+        return rows
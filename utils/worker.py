@@ -0,0 +1,93 @@
+import itertools
+import queue
+import threading
+import typing
+
+from timely.models.spenttime import session
+
+from PySide6.QtCore import QObject, Signal
+
+
+class QStorageWorker(QObject):
+    finished = Signal(int, object)
+    failed = Signal(int, object)
+
+    _instance = None
+    _reader = None
+
+    _counter = itertools.count(1)
+
+    def __init__(self, threads: int = 1, initializer: typing.Callable = None) -> None:
+        super().__init__()
+
+        self._queue = queue.Queue()
+        self._initializer = initializer
+
+        self._callbacks = {}
+        self._errbacks = {}
+
+        self.finished.connect(self.dispatchFinished)  # noqa
+        self.failed.connect(self.dispatchFailed)  # noqa
+
+        self._threads = [threading.Thread(target=self.run, daemon=True) for _ in range(threads)]
+        for thread in self._threads:
+            thread.start()
+
+    @classmethod
+    def instance(cls) -> "QStorageWorker":
+        if cls._instance is None:
+            cls._instance = cls()
+
+        return cls._instance
+
+    @classmethod
+    def reader(cls, threads: int = 2) -> "QStorageWorker":
+        if cls._reader is None:
+            cls._reader = cls(threads, lambda: session.setReadOnly(True))
+
+        return cls._reader
+
+    def isWorkerThread(self) -> bool:
+        return threading.current_thread() in self._threads
+
+    def submit(self, function: typing.Callable, *args: object, callback: typing.Callable = None,
+               errback: typing.Callable = None) -> int:
+        request = next(self._counter)
+
+        if callback is not None:
+            self._callbacks[request] = callback
+        if errback is not None:
+            self._errbacks[request] = errback
+
+        self._queue.put((request, function, args))
+
+        return request
+
+    def join(self) -> None:
+        self._queue.join()
+
+    def run(self) -> None:
+        if callable(self._initializer):
+            self._initializer()
+
+        while True:
+            request, function, args = self._queue.get()
+
+            try:
+                self.finished.emit(request, function(*args))
+            except Exception as error:
+                self.failed.emit(request, error)
+            finally:
+                self._queue.task_done()
+
+    def dispatchFinished(self, request: int, result: object) -> None:
+        self._errbacks.pop(request, None)
+
+        if callable(callback := self._callbacks.pop(request, None)):
+            callback(result)
+
+    def dispatchFailed(self, request: int, error: Exception) -> None:
+        self._callbacks.pop(request, None)
+
+        if callable(errback := self._errbacks.pop(request, None)):
+            errback(error)